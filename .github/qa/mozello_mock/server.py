@@ -10,36 +10,97 @@ Implements only the endpoints required by ebooks_lv Mozello integration:
 - DELETE /v1/store/product/<handle>/picture/<uid>/
 - GET /v1/store/products/ (basic empty list)
 
-This is intentionally tiny and dependency-free (stdlib only).
+This is intentionally tiny and dependency-free (stdlib only); orjson is used
+for serialization when it happens to be installed.
 """
 
 from __future__ import annotations
 
+import itertools
 import json
 import os
-import re
 import threading
-import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
+try:  # Optional fast path; the mock container ships stdlib only.
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on environment
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
+_STORE_PREFIX = "/v1/store/"
+_REASONS = {s.value: s.phrase.encode("ascii") for s in HTTPStatus}
+MAX_BODY = 1 << 20  # 1 MiB; real payloads are a few KB of product JSON
+# Picture uids: unique per process even for uploads within the same millisecond.
+_UID_COUNTER = itertools.count(1)
+_PROTOCOL = "HTTP/1.1"
+
+
+def _head(status: int, length: int, close: bool) -> bytes:
+    return b"%s %d %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n%s\r\n" % (
+        _PROTOCOL.encode("ascii"),
+        status,
+        _REASONS[status],
+        length,
+        b"Connection: close\r\n" if close else b"",
+    )
+
+
+def _send_raw(handler: BaseHTTPRequestHandler, status: int, body: bytes) -> None:
+    # Status line, headers and body go out in one write instead of the
+    # send_response/send_header/end_headers sequence.
+    handler.log_request(status)
+    handler.wfile.write(_head(status, len(body), handler.close_connection) + body)
+
+
+# Fully pre-encoded error responses (keep-alive variant, close variant); the
+# hot reject paths then cost a single write with no dict/JSON/header work.
+_STATIC: dict[tuple[int, str], tuple[bytes, bytes]] = {}
+for _status, _code in (
+    (401, "unauthorized"),
+    (404, "not_found"),
+    (400, "invalid_payload"),
+    (400, "handle_required"),
+):
+    _body = _dumps({"error": True, "error_code": _code})
+    _STATIC[(_status, _code)] = (
+        _head(_status, len(_body), False) + _body,
+        _head(_status, len(_body), True) + _body,
+    )
+del _status, _code, _body
+
+
+def _send_static(handler: BaseHTTPRequestHandler, status: int, code: str) -> None:
+    handler.log_request(status)
+    handler.wfile.write(_STATIC[(status, code)][handler.close_connection])
+
 
 def _json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload).encode("utf-8")
-    handler.send_response(status)
-    handler.send_header("Content-Type", "application/json")
-    handler.send_header("Content-Length", str(len(body)))
-    handler.end_headers()
-    handler.wfile.write(body)
+    _send_raw(handler, status, _dumps(payload))
+
+
+class _PayloadTooLarge(ValueError):
+    pass
 
 
 def _read_json(handler: BaseHTTPRequestHandler) -> dict:
     length = int(handler.headers.get("Content-Length", "0") or "0")
+    if length > MAX_BODY:
+        raise _PayloadTooLarge(length)
     raw = handler.rfile.read(length) if length else b""
     if not raw:
         return {}
     try:
-        return json.loads(raw.decode("utf-8"))
+        return _loads(raw)
     except Exception:
         return {}
 
@@ -52,183 +113,238 @@ def _auth_ok(handler: BaseHTTPRequestHandler) -> bool:
 
 def _merge_text(existing, incoming):
     # Multilanguage text merge: keep existing language keys unless overwritten.
+    # Mutates ``existing`` in place; callers hold the handle lock.
     if isinstance(existing, dict) and isinstance(incoming, dict):
-        out = dict(existing)
-        out.update(incoming)
-        return out
+        existing.update(incoming)
+        return existing
     return incoming
 
 
+_LOCK_STRIPES = 16
+
+
 class _State:
+    """Product/picture store guarded by striped per-handle locks.
+
+    Requests for different handles only contend when their handles hash to
+    the same stripe; whole-store reads take every stripe in a fixed order.
+    """
+
     def __init__(self) -> None:
-        self.lock = threading.Lock()
+        self.locks = [threading.Lock() for _ in range(_LOCK_STRIPES)]
         self.products: dict[str, dict] = {}
-        self.pictures: dict[str, list[dict]] = {}
+        # handle -> uid -> {"url", "filename"}; dicts keep insertion order.
+        self.pictures: dict[str, dict[str, dict]] = {}
+
+    def lock_for(self, handle: str) -> threading.Lock:
+        return self.locks[hash(handle) % _LOCK_STRIPES]
+
+    @contextmanager
+    def all_locks(self):
+        with ExitStack() as stack:
+            for lock in self.locks:
+                stack.enter_context(lock)
+            yield
 
 
 STATE = _State()
 
 
+def _picture_items(pics: dict[str, dict] | None) -> list[dict]:
+    return [{"uid": uid, "url": p["url"]} for uid, p in (pics or {}).items()]
+
+
+def _products_list(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # GET /v1/store/products/
+    qs = parse_qs(query or "")
+    page_size = int((qs.get("page_size") or ["100"])[0])
+    # Encode each product straight into the response buffer rather than
+    # collecting an intermediate list of dicts for one big dumps() call.
+    buf = bytearray(b'{"error": false, "products": [')
+    with STATE.all_locks():
+        handles = sorted(STATE.products.keys())
+        for i, h in enumerate(handles[:page_size]):
+            p = STATE.products[h]
+            if i:
+                buf += b", "
+            buf += _dumps({
+                "handle": h,
+                "title": p.get("title"),
+                "price": p.get("price"),
+                "category_handle": p.get("category_handle"),
+                "url": p.get("url"),
+                "full_url": p.get("full_url"),
+            })
+    buf += b'], "next_page_uri": null}'
+    return _send_raw(handler, 200, buf)
+
+
+def _product_get(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # GET /v1/store/product/<handle>/
+    with STATE.lock_for(handle):
+        product = STATE.products.get(handle)
+        if not product:
+            return _send_static(handler, 404, "not_found")
+        payload = dict(product)
+        payload["handle"] = handle
+        payload["pictures"] = _picture_items(STATE.pictures.get(handle))
+        # Encode under the lock: text fields are merged in place by PUT.
+        body = _dumps({"error": False, "product": payload})
+    return _send_raw(handler, 200, body)
+
+
+def _pictures_list(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # GET /v1/store/product/<handle>/pictures/
+    with STATE.lock_for(handle):
+        pics = _picture_items(STATE.pictures.get(handle))
+    return _json_response(handler, 200, {"error": False, "pictures": pics})
+
+
+def _product_create(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # POST /v1/store/product/
+    product = body.get("product") if isinstance(body, dict) else None
+    if not isinstance(product, dict):
+        return _send_static(handler, 400, "invalid_payload")
+    handle = (product.get("handle") or "").strip()
+    if not handle:
+        return _send_static(handler, 400, "handle_required")
+    with STATE.lock_for(handle):
+        STATE.products.setdefault(handle, {})
+        STATE.products[handle].update({k: v for k, v in product.items() if k != "handle"})
+        STATE.pictures.setdefault(handle, {})
+    return _json_response(handler, 200, {"error": False, "product": {"handle": handle}})
+
+
+def _picture_create(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # POST /v1/store/product/<handle>/picture/
+    picture = body.get("picture") if isinstance(body, dict) else None
+    if not isinstance(picture, dict):
+        return _send_static(handler, 400, "invalid_payload")
+    uid = f"uid-{next(_UID_COUNTER)}"
+    url = f"http://mozello-mock.local/images/{uid}.jpg"
+    with STATE.lock_for(handle):
+        STATE.products.setdefault(handle, {})
+        STATE.pictures.setdefault(handle, {})[uid] = {"url": url, "filename": picture.get("filename")}
+    return _json_response(handler, 200, {"error": False, "picture": {"uid": uid, "url": url}})
+
+
+def _product_update(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # PUT /v1/store/product/<handle>/
+    product_in = body.get("product") if isinstance(body, dict) else None
+    if not isinstance(product_in, dict):
+        return _send_static(handler, 400, "invalid_payload")
+
+    options = body.get("options") if isinstance(body, dict) else None
+    text_merge = isinstance(options, dict) and options.get("text_update_mode") == "merge"
+
+    with STATE.lock_for(handle):
+        if handle not in STATE.products:
+            return _send_static(handler, 404, "not_found")
+        current = STATE.products[handle]
+
+        for k, v in product_in.items():
+            if text_merge and k in ("title", "description", "url", "full_url"):
+                merged = _merge_text(current.get(k), v)
+                if merged is not current.get(k):
+                    current[k] = merged
+            else:
+                current[k] = v
+
+    return _json_response(handler, 200, {"error": False, "product": {"handle": handle}})
+
+
+def _picture_delete(handler: BaseHTTPRequestHandler, handle, uid, body: dict, query: str):
+    # DELETE /v1/store/product/<handle>/picture/<uid>/
+    with STATE.lock_for(handle):
+        pics = STATE.pictures.get(handle)
+        removed = pics.pop(uid, None) if pics else None
+    if removed is None:
+        return _send_static(handler, 404, "not_found")
+    return _json_response(handler, 200, {"error": False, "status": "deleted"})
+
+
+# Route table keyed on (method, *path segments); "*" marks the variable
+# <handle> (segment 3) and <uid> (segment 5) positions.
+_ROUTES = {
+    ("GET", "v1", "store", "products"): _products_list,
+    ("GET", "v1", "store", "product", "*"): _product_get,
+    ("GET", "v1", "store", "product", "*", "pictures"): _pictures_list,
+    ("POST", "v1", "store", "product"): _product_create,
+    ("POST", "v1", "store", "product", "*", "picture"): _picture_create,
+    ("PUT", "v1", "store", "product", "*"): _product_update,
+    ("DELETE", "v1", "store", "product", "*", "picture", "*"): _picture_delete,
+}
+
+
+@lru_cache(maxsize=1024)
+def _route(method: str, path: str):
+    """Resolve ``(route_fn, handle, uid)`` for a request path.
+
+    Paths are split once and looked up in ``_ROUTES``; every endpoint ends
+    with a slash and has no empty segments, anything else is unrouted.
+    QA runs hit a handful of distinct paths, so results are memoized.
+    """
+    if not (path.startswith(_STORE_PREFIX) and path.endswith("/")):
+        return None, None, None
+    parts = path[1:-1].split("/")
+    if "" in parts:
+        return None, None, None
+    handle = uid = None
+    if len(parts) > 3:
+        handle = parts[3]
+        parts[3] = "*"
+    if len(parts) > 5:
+        uid = parts[5]
+        parts[5] = "*"
+    return _ROUTES.get((method, *parts)), handle, uid
+
+
 class Handler(BaseHTTPRequestHandler):
     server_version = "mozello-mock/0.1"
+    # Keep-alive: every response carries Content-Length, and request bodies are
+    # always drained so the connection can be reused by the client.
+    protocol_version = _PROTOCOL
 
     def log_message(self, fmt: str, *args):
         # Keep QA output quieter.
         if os.getenv("MZ_MOCK_VERBOSE") == "1":
             super().log_message(fmt, *args)
 
-    def do_GET(self):
+    def _dispatch(self, method: str):
         if not _auth_ok(self):
-            return _json_response(self, 401, {"error": True, "error_code": "unauthorized"})
+            # Rejected before the body is drained: do not reuse the connection.
+            self.close_connection = True
+            return _send_static(self, 401, "unauthorized")
 
         parsed = urlparse(self.path)
-        path = parsed.path
-
-        # GET /v1/store/products/
-        if re.fullmatch(r"/v1/store/products/", path):
-            qs = parse_qs(parsed.query or "")
-            page_size = int((qs.get("page_size") or ["100"])[0])
-            with STATE.lock:
-                handles = sorted(STATE.products.keys())
-                items = []
-                for h in handles[:page_size]:
-                    p = STATE.products[h]
-                    items.append({
-                        "handle": h,
-                        "title": p.get("title"),
-                        "price": p.get("price"),
-                        "category_handle": p.get("category_handle"),
-                        "url": p.get("url"),
-                        "full_url": p.get("full_url"),
-                    })
-            return _json_response(self, 200, {"error": False, "products": items, "next_page_uri": None})
-
-        # GET /v1/store/product/<handle>/
-        m = re.fullmatch(r"/v1/store/product/([^/]+)/", path)
-        if m:
-            handle = m.group(1)
-            with STATE.lock:
-                product = STATE.products.get(handle)
-                pics = STATE.pictures.get(handle, [])
-            if not product:
-                return _json_response(self, 404, {"error": True, "error_code": "not_found"})
-            payload = dict(product)
-            payload["handle"] = handle
-            payload["pictures"] = [{"uid": p["uid"], "url": p["url"]} for p in pics]
-            return _json_response(self, 200, {"error": False, "product": payload})
-
-        # GET /v1/store/product/<handle>/pictures/
-        m = re.fullmatch(r"/v1/store/product/([^/]+)/pictures/", path)
-        if m:
-            handle = m.group(1)
-            with STATE.lock:
-                pics = list(STATE.pictures.get(handle, []))
-            return _json_response(self, 200, {"error": False, "pictures": [{"uid": p["uid"], "url": p["url"]} for p in pics]})
-
-        return _json_response(self, 404, {"error": True, "error_code": "not_found"})
+        try:
+            body = _read_json(self)
+        except _PayloadTooLarge:
+            # Body left unread: same as above.
+            self.close_connection = True
+            return _json_response(self, 413, {"error": True, "error_code": "payload_too_large"})
+        fn, handle, uid = _route(method, parsed.path)
+        if fn is None:
+            return _send_static(self, 404, "not_found")
+        return fn(self, handle, uid, body, parsed.query)
 
-    def do_POST(self):
-        if not _auth_ok(self):
-            return _json_response(self, 401, {"error": True, "error_code": "unauthorized"})
+    def do_GET(self):
+        return self._dispatch("GET")
 
-        parsed = urlparse(self.path)
-        path = parsed.path
-        body = _read_json(self)
-
-        # POST /v1/store/product/
-        if re.fullmatch(r"/v1/store/product/", path):
-            product = body.get("product") if isinstance(body, dict) else None
-            if not isinstance(product, dict):
-                return _json_response(self, 400, {"error": True, "error_code": "invalid_payload"})
-            handle = (product.get("handle") or "").strip()
-            if not handle:
-                return _json_response(self, 400, {"error": True, "error_code": "handle_required"})
-            with STATE.lock:
-                STATE.products.setdefault(handle, {})
-                STATE.products[handle].update({k: v for k, v in product.items() if k != "handle"})
-                STATE.pictures.setdefault(handle, [])
-            return _json_response(self, 200, {"error": False, "product": {"handle": handle}})
-
-        # POST /v1/store/product/<handle>/picture/
-        m = re.fullmatch(r"/v1/store/product/([^/]+)/picture/", path)
-        if m:
-            handle = m.group(1)
-            picture = body.get("picture") if isinstance(body, dict) else None
-            if not isinstance(picture, dict):
-                return _json_response(self, 400, {"error": True, "error_code": "invalid_payload"})
-            uid = f"uid-{int(time.time() * 1000)}"
-            url = f"http://mozello-mock.local/images/{uid}.jpg"
-            with STATE.lock:
-                STATE.products.setdefault(handle, {})
-                STATE.pictures.setdefault(handle, [])
-                STATE.pictures[handle].append({"uid": uid, "url": url, "filename": picture.get("filename")})
-            return _json_response(self, 200, {"error": False, "picture": {"uid": uid, "url": url}})
-
-        return _json_response(self, 404, {"error": True, "error_code": "not_found"})
+    def do_POST(self):
+        return self._dispatch("POST")
 
     def do_PUT(self):
-        if not _auth_ok(self):
-            return _json_response(self, 401, {"error": True, "error_code": "unauthorized"})
-
-        parsed = urlparse(self.path)
-        path = parsed.path
-        body = _read_json(self)
-
-        m = re.fullmatch(r"/v1/store/product/([^/]+)/", path)
-        if not m:
-            return _json_response(self, 404, {"error": True, "error_code": "not_found"})
-
-        handle = m.group(1)
-        product_in = body.get("product") if isinstance(body, dict) else None
-        if not isinstance(product_in, dict):
-            return _json_response(self, 400, {"error": True, "error_code": "invalid_payload"})
-
-        options = body.get("options") if isinstance(body, dict) else None
-        text_merge = isinstance(options, dict) and options.get("text_update_mode") == "merge"
-
-        with STATE.lock:
-            if handle not in STATE.products:
-                return _json_response(self, 404, {"error": True, "error_code": "not_found"})
-            current = STATE.products[handle]
-
-            for k, v in product_in.items():
-                if text_merge and k in ("title", "description", "url", "full_url"):
-                    current[k] = _merge_text(current.get(k), v)
-                else:
-                    current[k] = v
-
-        return _json_response(self, 200, {"error": False, "product": {"handle": handle}})
+        return self._dispatch("PUT")
 
     def do_DELETE(self):
-        if not _auth_ok(self):
-            return _json_response(self, 401, {"error": True, "error_code": "unauthorized"})
-
-        parsed = urlparse(self.path)
-        path = parsed.path
-
-        # DELETE /v1/store/product/<handle>/picture/<uid>/
-        m = re.fullmatch(r"/v1/store/product/([^/]+)/picture/([^/]+)/", path)
-        if m:
-            handle = m.group(1)
-            uid = m.group(2)
-            with STATE.lock:
-                pics = STATE.pictures.get(handle)
-                if not pics:
-                    return _json_response(self, 404, {"error": True, "error_code": "not_found"})
-                before = len(pics)
-                STATE.pictures[handle] = [p for p in pics if p.get("uid") != uid]
-                after = len(STATE.pictures[handle])
-            if before == after:
-                return _json_response(self, 404, {"error": True, "error_code": "not_found"})
-            return _json_response(self, 200, {"error": False, "status": "deleted"})
-
-        return _json_response(self, 404, {"error": True, "error_code": "not_found"})
+        return self._dispatch("DELETE")
 
 
 def main() -> int:
     host = os.getenv("MZ_MOCK_HOST", "0.0.0.0")
     port = int(os.getenv("MZ_MOCK_PORT", "9090"))
-    httpd = HTTPServer((host, port), Handler)
+    httpd = ThreadingHTTPServer((host, port), Handler)
     print(f"[mozello-mock] listening on http://{host}:{port}/v1")
     httpd.serve_forever()
     return 0
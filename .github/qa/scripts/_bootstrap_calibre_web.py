@@ -6,17 +6,46 @@ They import and initialize Calibre-Web without starting the web server.
 """
 from __future__ import annotations
 
+import os
 import sys
 
+# Initialized Calibre-Web app, shared by every caller in this interpreter.
+_APP = None
+
+# Resulting sys.path prefix, highest priority first.
+_SYS_PATHS = ("/app/calibre-web", "/app")
+
 
 def ensure_sys_path() -> None:
-    for p in ("/app", "/app/calibre-web"):
-        if p not in sys.path:
-            sys.path.insert(0, p)
+    have = set(sys.path)
+    sys.path[:0] = [p for p in _SYS_PATHS if p not in have]
+
+
+def app_db_path() -> str:
+    """Return the Calibre-Web app.db path (``$CALIBRE_DBPATH`` or /app/config)."""
+    db_dir = os.environ.get("CALIBRE_DBPATH") or "/app/config"
+    return os.path.join(db_dir, "app.db")
+
+
+def open_app_db_session():
+    """Return a new thread-bound ``ub`` session on app.db, without the app bootstrap."""
+    ensure_sys_path()
+    from cps import ub  # type: ignore
+
+    ub.app_DB_path = app_db_path()  # type: ignore[attr-defined]
+    return ub.init_db_thread()
 
 
 def bootstrap_calibre_web_app():
-    """Return the Calibre-Web Flask app instance or None on failure."""
+    """Return the Calibre-Web Flask app instance or None on failure.
+
+    ``cps.main.main()`` runs only once per process; later calls reuse the
+    cached app so QA drivers chaining several helpers pay init cost once.
+    """
+    global _APP
+    if _APP is not None:
+        return _APP
+
     ensure_sys_path()
     try:
         import cps.main  # type: ignore
@@ -36,4 +65,26 @@ def bootstrap_calibre_web_app():
         web_server.start = orig_start
         sys.exit = orig_exit
 
-    return cw_app
+    _APP = cw_app
+    return _APP
+
+
+def build_stub_app():
+    """Return a bare Flask app carrying Calibre-Web's SECRET_KEY, or None.
+
+    For helpers that only need Calibre users, the users_books DB and the
+    Flask secret (e.g. auth-link tokens). Skips ``cps.main.main()`` and the
+    ebooks.lv wiring; binds ``ub.session`` to app.db as a side effect.
+    """
+    ensure_sys_path()
+    try:
+        from flask import Flask  # type: ignore
+        from cps import ub, config_sql  # type: ignore
+    except Exception:
+        return None
+
+    if getattr(ub, "session", None) is None:
+        ub.init_db(app_db_path())
+    app = Flask("ebookslv_qa_stub")
+    app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY") or config_sql.get_flask_session_key(ub.session)
+    return app
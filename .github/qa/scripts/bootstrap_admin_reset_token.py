@@ -10,32 +10,34 @@ Env (optional):
 Output JSON: {status,email,url,token}
 Exit codes: 0 ok, 2 import fail, 3 token fail
 
-Note: Uses the real Flask app so token encoding has access to SECRET_KEY.
+Note: Uses a bare Flask app carrying Calibre-Web's SECRET_KEY (read from
+app.db) so tokens match the running server without the full app bootstrap.
 """
 
 from __future__ import annotations
 
 import contextlib
-import io
 import json
 import os
-import sys
-import traceback
+
+# Sink for the wrapped code's chatty output; writes are discarded by the kernel
+# instead of accumulating in an in-memory buffer.
+_DEVNULL = open(os.devnull, "w")
 
 
 def main() -> int:
     try:
-        if "/app" not in sys.path:
-            sys.path.insert(0, "/app")
-        if "/app/calibre-web" not in sys.path:
-            sys.path.insert(0, "/app/calibre-web")
-
-        # The entrypoint wrapper is intentionally chatty (seed/mainwrap prints).
-        # Suppress that noise so this helper can emit clean JSON.
-        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
-            from entrypoint.entrypoint_mainwrap import application  # type: ignore
+        from _bootstrap_calibre_web import build_stub_app
+
+        # Calibre-Web imports can be chatty; suppress that noise so this helper
+        # can emit clean JSON.
+        with contextlib.redirect_stdout(_DEVNULL), contextlib.redirect_stderr(_DEVNULL):
+            application = build_stub_app()
             from app.services import password_reset_service  # type: ignore
+        if application is None:
+            raise RuntimeError("stub_app_unavailable")
     except Exception:
+        import traceback
         traceback.print_exc()
         print(json.dumps({"status": "error", "error": "import_failed"}))
         return 2
@@ -44,13 +46,14 @@ def main() -> int:
     email = (os.environ.get("QA_ADMIN_EMAIL") or "admin@example.org").strip()
 
     try:
-        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        with contextlib.redirect_stdout(_DEVNULL), contextlib.redirect_stderr(_DEVNULL):
             with application.app_context():
                 token = password_reset_service.issue_reset_token(email=email)
         url = f"{base_url}/login?auth={token}"
         print(json.dumps({"status": "ok", "email": email, "url": url, "token": token}))
         return 0
     except Exception as exc:
+        import traceback
         traceback.print_exc()
         print(json.dumps({"status": "error", "error": str(exc)}))
         return 3
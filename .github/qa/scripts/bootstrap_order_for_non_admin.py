@@ -18,7 +18,7 @@ import json
 import os
 import sqlite3
 import sys
-import traceback
+from urllib.parse import quote
 
 if "/app" not in sys.path:
     sys.path.insert(0, "/app")
@@ -33,9 +33,10 @@ def _pick_first_book_id() -> int | None:
     if not os.path.exists(db_path):
         return None
     try:
-        with sqlite3.connect(db_path) as conn:
-            row = conn.execute("SELECT id FROM books ORDER BY id ASC LIMIT 1").fetchone()
-            return int(row[0]) if row else None
+        # Read-only URI open: no journal/lock files are created for a single lookup.
+        with sqlite3.connect(f"file:{quote(db_path)}?mode=ro", uri=True) as conn:
+            row = conn.execute("SELECT MIN(id) FROM books").fetchone()
+            return int(row[0]) if row and row[0] is not None else None
     except Exception:
         return None
 
@@ -63,6 +64,7 @@ def main() -> int:
         from app.db.engine import init_engine_once  # type: ignore
         from app.db.repositories import users_books_repo  # type: ignore
     except Exception:
+        import traceback
         traceback.print_exc()
         print(json.dumps({"status": "error", "error": "import_failed"}))
         return 2
@@ -103,6 +105,7 @@ def main() -> int:
         )
         return 0
     except Exception as exc:
+        import traceback
         traceback.print_exc()
         print(json.dumps({"status": "error", "error": str(exc)}))
         return 3
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Ensure the deterministic QA admin and non-admin users exist.
+
+Both users are created/updated in one app.db session with a single commit.
+
+Usage:
+  bootstrap_users.py              # admin + non-admin
+  bootstrap_users.py admin        # admin only
+  bootstrap_users.py user         # non-admin only
+
+Env (optional):
+  QA_ADMIN_USERNAME (default: admin)
+  QA_ADMIN_PASSWORD (default: AdminTest123!)
+  QA_ADMIN_EMAIL (default: admin@example.org)
+  QA_USER_USERNAME (default: qa_user)
+  QA_USER_PASSWORD (default: qa_user123)
+  QA_USER_EMAIL (default: qa_user@example.test)
+
+Output JSON: a single target prints {status,created,updated,username,email,user_id,role};
+both targets print {status,users:[...]}.
+Exit codes: 0 ok, 2 bootstrap/import failure, 3 DB error
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+
+from _bootstrap_calibre_web import open_app_db_session
+
+TARGETS = ("admin", "user")
+
+# Werkzeug hashes for the documented default QA passwords, generated once with
+# generate_password_hash(pw, method="pbkdf2:sha256"). The KDF is deliberately
+# slow, so defaults skip it; any overridden password is hashed as usual.
+_QA_DEFAULT_HASHES = {
+    "AdminTest123!": "pbkdf2:sha256:1000000$O2oZMWIsYVRB8WcV$a13470f1d83db5d41385a8f80ed6999001973e9f0467403504789634becb1086",
+    "qa_user123": "pbkdf2:sha256:1000000$UaeD2sqMnU9XbiHD$b41563d3a57969661c221adb628e69ea45f971c72824833fb3cc42993e461105",
+}
+
+
+def _user_spec(target: str, constants) -> tuple[str, str, str, int]:
+    if target == "admin":
+        return (
+            (os.environ.get("QA_ADMIN_USERNAME") or "admin").strip(),
+            os.environ.get("QA_ADMIN_PASSWORD") or "AdminTest123!",
+            (os.environ.get("QA_ADMIN_EMAIL") or "admin@example.org").strip(),
+            int(constants.ADMIN_USER_ROLES),
+        )
+    # Ensure the user can log in: viewer + password.
+    return (
+        (os.environ.get("QA_USER_USERNAME") or "qa_user").strip(),
+        os.environ.get("QA_USER_PASSWORD") or "qa_user123",
+        (os.environ.get("QA_USER_EMAIL") or "qa_user@example.test").strip(),
+        int(constants.ROLE_VIEWER | constants.ROLE_PASSWD),
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    targets = [t for t in (sys.argv[1:] if argv is None else argv) if t in TARGETS] or list(TARGETS)
+
+    session = open_app_db_session()
+
+    try:
+        from cps import ub, constants  # type: ignore
+        from werkzeug.security import generate_password_hash  # type: ignore
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        print(json.dumps({"status": "error", "error": "import_failed"}))
+        return 2
+
+    try:
+        rows = []
+        for target in targets:
+            username, password, email, desired_role = _user_spec(target, constants)
+            created = False
+            updated = False
+            user = session.query(ub.User).filter(ub.User.name == username).first()
+            if not user:
+                user = ub.User()
+                user.name = username
+                user.email = email
+                user.role = desired_role
+                session.add(user)
+                created = True
+            else:
+                updated = True
+                if email:
+                    user.email = email
+                # Ensure role bitmask in case the user existed with another role
+                user.role = desired_role
+            user.password = _QA_DEFAULT_HASHES.get(password) or generate_password_hash(password)
+            rows.append((user, username, created, updated))
+
+        session.commit()
+        results = [
+            {
+                "status": "ok",
+                "created": created,
+                "updated": updated,
+                "username": username,
+                "email": user.email,
+                "user_id": int(getattr(user, "id", -1)),
+                "role": int(getattr(user, "role", -1)),
+            }
+            for user, username, created, updated in rows
+        ]
+        if len(results) == 1:
+            print(json.dumps(results[0]))
+        else:
+            print(json.dumps({"status": "ok", "users": results}))
+        return 0
+    except Exception as exc:
+        import traceback
+        traceback.print_exc()
+        try:
+            session.rollback()
+        except Exception:
+            pass
+        print(json.dumps({"status": "error", "error": str(exc)}))
+        return 3
+    finally:
+        try:
+            session.close()
+        except Exception:
+            pass
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Run QA bootstrap helpers in one interpreter.
+
+Equivalent to running, in order:
+  bootstrap_users.py                      (step: users)
+  bootstrap_order_for_non_admin.py        (step: order)
+  bootstrap_price_for_sample_book.py      (step: price)
+  bootstrap_mz_pictures_for_sample_book.py (step: pictures)
+
+Modules shared by the helpers (cps.*, app.*) are imported once and reused via
+sys.modules instead of being re-imported by a fresh process per helper.
+
+Usage:
+  qa_bootstrap_all.py                 # every step
+  qa_bootstrap_all.py order price     # selected steps, in the order given
+
+From Python (e.g. a long-lived shell): ``import qa_bootstrap_all; qa_bootstrap_all.run("order")``.
+
+Output: each helper's JSON line, in order.
+Exit codes: the first non-zero helper exit code (remaining helpers are
+skipped), else 0.
+"""
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import sys
+
+STEPS = {
+    "users": "bootstrap_users",
+    "order": "bootstrap_order_for_non_admin",
+    "price": "bootstrap_price_for_sample_book",
+    "pictures": "bootstrap_mz_pictures_for_sample_book",
+}
+
+
+def run(step: str) -> int:
+    name = STEPS[step]
+    module = importlib.import_module(name)
+    return module.main([]) if name == "bootstrap_users" else module.main()
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run QA bootstrap helpers in one process.")
+    parser.add_argument("steps", nargs="*", metavar="step", help="one of: " + ", ".join(STEPS))
+    args = parser.parse_args(argv)
+    unknown = [step for step in args.steps if step not in STEPS]
+    if unknown:
+        parser.error(f"unknown step(s): {', '.join(unknown)}")
+
+    for step in args.steps or STEPS:
+        code = run(step)
+        if code:
+            sys.stderr.write(f"[qa] {STEPS[step]} failed with exit code {code}\n")
+            return code
+    return 0
+
+
+if __name__ == "__main__":
+    code = main()
+    sys.stdout.flush()
+    os._exit(code)
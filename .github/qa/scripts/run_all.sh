@@ -30,11 +30,7 @@ if [[ "$code" != "200" ]]; then
 fi
 
 echo "[qa] Bootstrapping deterministic QA users/orders (in-container)"
-docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/bootstrap_admin.py
-docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/bootstrap_non_admin_user.py
-docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/bootstrap_order_for_non_admin.py
-docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/bootstrap_price_for_sample_book.py
-docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/bootstrap_mz_pictures_for_sample_book.py
+docker compose -f compose.yml -f compose.dev.yml -f .github/qa/compose.mozello-mock.yml exec -T calibre-web python /app/.github/qa/scripts/qa_bootstrap_all.py
 
 echo ""
 echo "[qa] Ready"
@@ -3,10 +3,15 @@
 Centralizes environment variable parsing & defaults. We preserve existing
 environment variable names from the legacy plugin for backward compatibility
 so operators do not need to change deployment configs immediately.
+
+The environment is fixed for the life of a worker, so the hot accessors are
+memoized; call :func:`reset_config_cache` after changing the environment
+(tests do this automatically).
 """
 from __future__ import annotations
 
 import os
+import tempfile
 from functools import lru_cache
 
 # Metadata (mirrors old plugin, could expand later)
@@ -16,7 +21,11 @@ APP_DESCRIPTION = "Integrated users_books allow-list admin UI"
 
 DEFAULT_DB_PATH = "users_books.db"
 DEFAULT_LOG_LEVEL = "INFO"
-_TRUE = {"1", "true", "yes", "on"}
+# Recognized boolean spellings; anything else falls back to the caller's default.
+_BOOL_MAP = {
+    "1": True, "true": True, "yes": True, "on": True,
+    "0": False, "false": False, "no": False, "off": False,
+}
 
 
 def _raw_env(name: str, default: str | None = None) -> str | None:
@@ -25,12 +34,20 @@ def _raw_env(name: str, default: str | None = None) -> str | None:
 
 
 def env_bool(name: str, default: bool = False) -> bool:
-    raw = _raw_env(name, str(default).lower())
+    """Read ``name`` as a boolean flag.
+
+    ``1/true/yes/on`` and ``0/false/no/off`` are accepted in any case, with
+    surrounding whitespace ignored. An unset variable *or an unrecognized
+    value* (e.g. a typo such as ``ture``) returns ``default``, so a misspelled
+    flag keeps the built-in behaviour instead of silently turning it off.
+    """
+    raw = os.environ.get(name)
     if raw is None:
         return default
-    return raw.lower() in _TRUE
+    return _BOOL_MAP.get(raw.strip().lower(), default)
 
 
+@lru_cache(maxsize=1)
 def get_db_path() -> str:
     raw = _raw_env("USERS_BOOKS_DB_PATH", DEFAULT_DB_PATH)  # legacy var name
     if raw and not os.path.isabs(raw):
@@ -40,11 +57,13 @@ def get_db_path() -> str:
     return raw  # type: ignore[return-value]
 
 
+@lru_cache(maxsize=1)
 def session_email_key() -> str:
     # Preserve legacy env variable naming for compatibility
     return os.getenv("USERS_BOOKS_SESSION_EMAIL_KEY", "email")
 
 
+@lru_cache(maxsize=1)
 def log_level_name() -> str:
     return _raw_env("USERS_BOOKS_LOG_LEVEL", DEFAULT_LOG_LEVEL).upper()  # type: ignore[return-value]
 
@@ -88,6 +107,7 @@ __all__ = [
 ]
 
 
+@lru_cache(maxsize=1)
 def public_domain() -> str | None:
     """Public hostname configured for droplet HTTPS (EBOOKSLV_DOMAIN)."""
     value = os.getenv("EBOOKSLV_DOMAIN")
@@ -100,6 +120,7 @@ def public_domain() -> str | None:
 __all__.append("public_domain")
 
 
+@lru_cache(maxsize=1)
 def mozello_api_key() -> str | None:
     """Return MOZELLO_API_KEY from environment (no default)."""
     value = os.getenv("MOZELLO_API_KEY")
@@ -111,6 +132,7 @@ def mozello_api_key() -> str | None:
 __all__.append("mozello_api_key")
 
 
+@lru_cache(maxsize=1)
 def mozello_store_url() -> str | None:
     """Optional Mozello store URL from environment."""
     value = os.getenv("MOZELLO_STORE_URL")
@@ -122,6 +144,7 @@ def mozello_store_url() -> str | None:
 __all__.append("mozello_store_url")
 
 
+@lru_cache(maxsize=1)
 def mozello_webhook_force_port() -> str | None:
     """Optional explicit port to force into computed Mozello webhook URL.
 
@@ -139,6 +162,7 @@ def mozello_webhook_force_port() -> str | None:
 __all__.append("mozello_webhook_force_port")
 
 
+@lru_cache(maxsize=1)
 def mozello_api_base() -> str:
     """Base URL for Mozello API (override with MOZELLO_API_BASE).
 
@@ -150,6 +174,7 @@ def mozello_api_base() -> str:
 __all__.append("mozello_api_base")
 
 
+@lru_cache(maxsize=1)
 def admin_bootstrap_enabled() -> bool:
     """Whether to force-set the Calibre admin password on startup.
 
@@ -164,6 +189,7 @@ def admin_bootstrap_enabled() -> bool:
 __all__.append("admin_bootstrap_enabled")
 
 
+@lru_cache(maxsize=1)
 def admin_bootstrap_email() -> str:
     """Admin email to target for bootstrap password changes.
 
@@ -177,6 +203,7 @@ def admin_bootstrap_email() -> str:
 __all__.append("admin_bootstrap_email")
 
 
+@lru_cache(maxsize=1)
 def admin_bootstrap_password() -> str:
     """Admin password to apply during bootstrap.
 
@@ -188,3 +215,68 @@ def admin_bootstrap_password() -> str:
 
 
 __all__.append("admin_bootstrap_password")
+
+
+def jinja_bytecode_cache_dir() -> str | None:
+    """Directory for compiled Jinja template bytecode shared across workers.
+
+    Environment Variable: EBOOKSLV_JINJA_BYTECODE_CACHE_DIR
+    Default: <system temp dir>/ebookslv_jinja. Set to ``off`` (or ``0``,
+    ``false``, ``no``) to disable the bytecode cache.
+    """
+    raw = (os.getenv("EBOOKSLV_JINJA_BYTECODE_CACHE_DIR") or "").strip()
+    if raw.lower() in {"off", "0", "false", "no"}:
+        return None
+    return raw or os.path.join(tempfile.gettempdir(), "ebookslv_jinja")
+
+
+__all__.append("jinja_bytecode_cache_dir")
+
+
+DEFAULT_CALIBRE_LIBRARY_PATH = "/app/library"
+
+
+@lru_cache(maxsize=1)
+def calibre_library_path() -> str:
+    """Calibre library root holding metadata.db (CALIBRE_LIBRARY_PATH)."""
+    return os.getenv("CALIBRE_LIBRARY_PATH", DEFAULT_CALIBRE_LIBRARY_PATH)
+
+
+__all__.append("calibre_library_path")
+
+
+@lru_cache(maxsize=1)
+def mozello_webhook_dump_path() -> str | None:
+    """Optional directory for raw Mozello webhook dumps (MOZELLO_WEBHOOK_DUMP_PATH)."""
+    value = (os.getenv("MOZELLO_WEBHOOK_DUMP_PATH") or "").strip()
+    return value or None
+
+
+__all__.append("mozello_webhook_dump_path")
+
+
+# Accessors memoized with lru_cache above; kept in one place for resets.
+_CACHED_ACCESSORS = (
+    get_db_path,
+    session_email_key,
+    log_level_name,
+    public_domain,
+    mozello_api_key,
+    mozello_store_url,
+    mozello_webhook_force_port,
+    mozello_api_base,
+    admin_bootstrap_enabled,
+    admin_bootstrap_email,
+    admin_bootstrap_password,
+    calibre_library_path,
+    mozello_webhook_dump_path,
+)
+
+
+def reset_config_cache() -> None:
+    """Forget memoized environment values so the next call re-reads them."""
+    for accessor in _CACHED_ACCESSORS:
+        accessor.cache_clear()
+
+
+__all__.append("reset_config_cache")
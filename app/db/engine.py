@@ -13,7 +13,7 @@ except ImportError:  # pragma: no cover - non-POSIX fallback (not expected in dr
 from contextlib import contextmanager
 from typing import Optional, Iterator, Callable
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, scoped_session, Session as SASession
 
@@ -25,9 +25,48 @@ _engine: Optional[Engine] = None
 _SessionFactory: Optional[Callable[[], SASession]] = None
 _scoped: Optional[scoped_session] = None
 _LOCK = threading.Lock()
+# Directories already created and probed for write access in this process;
+# re-initialization (tests, reset_for_tests) skips the makedirs/access calls.
+_WRITABLE_DIRS: set[str] = set()
 
 LOG = get_logger("users_books.db")
 
+# Stored in SQLite's PRAGMA user_version once the Mozello orders schema is in
+# place; bump when _safe_create_schema gains a new upgrade step.
+SCHEMA_VERSION = 4
+# v2: single-column indexes duplicated by composite users_books indexes.
+# v4: reset token email index, covered by the (email, token_type) composite.
+_REDUNDANT_INDEXES = (
+    "ix_users_books_email",
+    "ix_users_books_mz_handle",
+    "ix_reset_password_tokens_email",
+)
+# v3: columns added to existing tables after their first release; create_all
+# never alters a table that already exists.
+_ADDED_COLUMNS = (
+    ("email_templates", "subject", "VARCHAR(255) NOT NULL DEFAULT ''"),
+)
+
+# Applied to every new DBAPI connection. WAL lets readers in other gunicorn
+# workers proceed while one writes; NORMAL sync is durable under WAL except
+# on power loss, which is acceptable for this order/token store.
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA foreign_keys=ON",
+)
+
+
+def _apply_sqlite_pragmas(dbapi_conn, _record) -> None:
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 
 def init_engine_once() -> None:
     global _engine, _SessionFactory, _scoped
@@ -39,15 +78,28 @@ def init_engine_once() -> None:
         db_path = app_config.get_db_path()
         LOG.info("Initializing users_books database engine at %s", db_path)
         parent_dir = os.path.dirname(os.path.abspath(db_path)) or "."
-        os.makedirs(parent_dir, exist_ok=True)
-        if not os.access(parent_dir, os.W_OK):
-            raise RuntimeError(f"users_books DB directory not writable: {parent_dir}")
-        _engine = create_engine(f"sqlite:///{db_path}", future=True)
+        if parent_dir not in _WRITABLE_DIRS:
+            os.makedirs(parent_dir, exist_ok=True)
+            if not os.access(parent_dir, os.W_OK):
+                raise RuntimeError(f"users_books DB directory not writable: {parent_dir}")
+            _WRITABLE_DIRS.add(parent_dir)
+        _engine = create_engine(
+            f"sqlite:///{db_path}",
+            future=True,
+            connect_args={"timeout": 30},
+        )
+        event.listen(_engine, "connect", _apply_sqlite_pragmas)
         _SessionFactory = sessionmaker(bind=_engine, expire_on_commit=False, class_=SASession)
         _scoped = scoped_session(_SessionFactory)
+        # Warm start: schema already stamped and complete, so no worker needs
+        # to queue on the cross-process lock below.
+        if not _needs_migration():
+            LOG.debug("users_books schema ready")
+            return
         # Cross-process lock to avoid race where multiple gunicorn workers attempt
         # to create the schema simultaneously (window between existence check and
-        # DDL emit can trigger 'table ... already exists').
+        # DDL emit can trigger 'table ... already exists'). _safe_create_schema
+        # re-reads the version under the lock.
         lock_path = os.path.join(parent_dir, ".users_books_schema.lock")
         if fcntl is not None:
             with open(lock_path, "w") as lf:  # lock file persists (harmless)
@@ -64,6 +116,21 @@ def init_engine_once() -> None:
         LOG.debug("users_books schema ready")
 
 
+def _needs_migration() -> bool:
+    """Lock-free check whether the DB is behind SCHEMA_VERSION or missing tables."""
+    try:
+        with _engine.connect() as conn:  # type: ignore[union-attr]
+            version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+            if version < SCHEMA_VERSION:
+                return True
+            existing = {
+                row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
+            }
+    except Exception:  # pragma: no cover - fall back to the locked path
+        return True
+    return not set(Base.metadata.tables).issubset(existing)
+
+
 def _safe_create_schema():
     """Run metadata.create_all with defensive handling of race errors.
 
@@ -75,18 +142,32 @@ def _safe_create_schema():
     try:
         if _engine is None:
             return
-        # Detect legacy schema (pre-orders) and drop the table for a clean recreate.
         with _engine.begin() as conn:  # type: ignore[assignment]
-            table_exists = conn.execute(
-                text("SELECT name FROM sqlite_master WHERE type='table' AND name='users_books'")
-            ).fetchone()
-            if table_exists:
-                columns = conn.execute(text("PRAGMA table_info('users_books')")).fetchall()
-                col_names = {row[1] for row in columns}
-                if not {"email", "mz_handle"}.issubset(col_names):
-                    LOG.warning("Dropping legacy users_books table prior to Mozello orders schema upgrade")
-                    conn.execute(text("DROP TABLE users_books"))
+            version = conn.execute(text("PRAGMA user_version")).scalar() or 0
+            # Detect legacy schema (pre-orders) and drop the table for a clean
+            # recreate; databases already stamped with the current version skip it.
+            if version < SCHEMA_VERSION:
+                table_exists = conn.execute(
+                    text("SELECT name FROM sqlite_master WHERE type='table' AND name='users_books'")
+                ).fetchone()
+                if table_exists:
+                    columns = conn.execute(text("PRAGMA table_info('users_books')")).fetchall()
+                    col_names = {row[1] for row in columns}
+                    if not {"email", "mz_handle"}.issubset(col_names):
+                        LOG.warning("Dropping legacy users_books table prior to Mozello orders schema upgrade")
+                        conn.execute(text("DROP TABLE users_books"))
+                for index_name in _REDUNDANT_INDEXES:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
+                _add_missing_columns(conn)
         Base.metadata.create_all(_engine)  # type: ignore[arg-type]
+        if version < SCHEMA_VERSION:
+            with _engine.begin() as conn:  # type: ignore[assignment]
+                # create_all skips existing tables, including indexes declared
+                # on them after their first release.
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(conn, checkfirst=True)
+                conn.execute(text(f"PRAGMA user_version = {int(SCHEMA_VERSION)}"))
     except OperationalError as e:  # pragma: no cover - concurrency edge
         msg = str(e).lower()
         if "already exists" in msg:
@@ -95,6 +176,17 @@ def _safe_create_schema():
             raise
 
 
+def _add_missing_columns(conn) -> None:
+    inspector = inspect(conn)
+    for table, column, ddl in _ADDED_COLUMNS:
+        if not inspector.has_table(table):
+            continue  # create_all builds it with the column
+        if column in {col["name"] for col in inspector.get_columns(table)}:
+            continue
+        LOG.info("Adding %s.%s column", table, column)
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
 def get_engine() -> Engine:
     if _engine is None:
         init_engine_once()
@@ -117,8 +209,12 @@ def get_scoped_session() -> scoped_session:
 
 @contextmanager
 def app_session() -> Iterator[SASession]:
-    scoped = get_scoped_session()
-    sess = scoped()
+    """Yield a short-lived session committed on success and closed on exit.
+
+    A fresh session per block (rather than the thread-scoped registry) hands
+    its pooled connection back as soon as the block ends.
+    """
+    sess = get_session_factory()()
     try:
         yield sess
         sess.commit()
@@ -3,7 +3,6 @@
 Includes MozelloConfig for notification settings persistence.
 """
 from .users_books import (  # noqa: F401
-	UserFilter,
 	Base,
 	MozelloConfig,
 	MozelloNotificationLog,
@@ -13,7 +12,6 @@ from .users_books import (  # noqa: F401
 )
 
 __all__ = [
-	"UserFilter",
 	"MozelloOrder",
 	"Base",
 	"MozelloConfig",
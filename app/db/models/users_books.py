@@ -15,6 +15,11 @@ from sqlalchemy import (
 )
 from sqlalchemy.orm import declarative_base
 
+try:  # pragma: no cover - optional speedup
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
 Base = declarative_base()
 
 
@@ -28,8 +33,10 @@ class MozelloOrder(Base):
     __tablename__ = "users_books"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255), nullable=False, index=True)
-    mz_handle = Column(String(255), nullable=False, index=True)
+    # email and mz_handle lookups are served by the leading columns of the
+    # UNIQUE(email, mz_handle) and (mz_handle, email) indexes below.
+    email = Column(String(255), nullable=False)
+    mz_handle = Column(String(255), nullable=False)
     calibre_user_id = Column(Integer, nullable=True, index=True)
     calibre_book_id = Column(Integer, nullable=True, index=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
@@ -46,14 +53,15 @@ class MozelloOrder(Base):
     )
 
     def as_dict(self) -> dict:
-        imported = self.updated_at.isoformat() if self.updated_at else None
+        created, updated = self.created_at, self.updated_at
+        imported = updated.isoformat() if updated else None
         return {
             "id": self.id,
             "email": self.email,
             "mz_handle": self.mz_handle,
             "calibre_user_id": self.calibre_user_id,
             "calibre_book_id": self.calibre_book_id,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "created_at": created.isoformat() if created else None,
             "imported_at": imported,
             "updated_at": imported,  # backward compatibility alias
         }
@@ -70,13 +78,6 @@ class MozelloOrder(Base):
         )
 
 
-# Backward compatible alias for any legacy imports that still reference
-# the old name. Remove once callers migrate fully.
-UserFilter = MozelloOrder
-
-__all__ = ["Base", "MozelloOrder", "UserFilter"]
-
-
 # ---------------- Mozello Integration (notification settings storage) ---------------
 
 class MozelloConfig(Base):
@@ -108,20 +109,31 @@ class MozelloConfig(Base):
         "PRODUCT_DELETED",
         "STOCK_CHANGED",
     ]
+    # Membership checks; ALLOWED_EVENTS keeps the display order.
+    _ALLOWED_EVENTS_SET = frozenset(ALLOWED_EVENTS)
 
     def set_events(self, events):
-        cleaned = [e for e in events if e in self.ALLOWED_EVENTS]
-        self.notifications_wanted = json.dumps(cleaned)
+        if not events:
+            self.notifications_wanted = "[]"
+            return
+        cleaned = [e for e in events if e in MozelloConfig._ALLOWED_EVENTS_SET]
+        if orjson is not None:
+            self.notifications_wanted = orjson.dumps(cleaned).decode()
+        else:
+            self.notifications_wanted = json.dumps(cleaned)
 
     def events_list(self):
         if not self.notifications_wanted:
             return []
         try:
+            if orjson is not None:
+                return orjson.loads(self.notifications_wanted)
             return json.loads(self.notifications_wanted)
         except Exception:
             return []
 
     def as_dict(self):
+        updated = self.updated_at
         return {
             "api_key_set": bool(self.api_key),  # do not expose raw key here
             "notifications_url": self.notifications_url,
@@ -130,11 +142,9 @@ class MozelloConfig(Base):
             "store_url_ru": self.store_url_ru,
             "store_url_en": self.store_url_en,
             "notifications_wanted": self.events_list(),
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "updated_at": updated.isoformat() if updated else None,
         }
 
-__all__.append("MozelloConfig")
-
 
 class EmailTemplate(Base):
     """Stored HTML email templates scoped by template key + language."""
@@ -159,30 +169,28 @@ class EmailTemplate(Base):
     )
 
     def as_dict(self) -> dict:
+        created, updated = self.created_at, self.updated_at
         return {
             "id": self.id,
             "template_key": self.template_key,
             "language": self.language,
             "subject": self.subject or "",
             "html_body": self.html_body or "",
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "created_at": created.isoformat() if created else None,
+            "updated_at": updated.isoformat() if updated else None,
         }
 
     def __repr__(self) -> str:  # pragma: no cover
         return f"<EmailTemplate key={self.template_key} lang={self.language}>"
 
 
-__all__.append("EmailTemplate")
-
-
 class ResetPasswordToken(Base):
     """Temporary credential storage for initial and reset flows."""
 
     __tablename__ = "reset_password_tokens"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=True)
     token_type = Column(String(16), nullable=False)
     created_at = Column(DateTime, default=datetime.datetime.utcnow, nullable=False)
@@ -191,15 +199,17 @@ class ResetPasswordToken(Base):
     __table_args__ = (
         UniqueConstraint("email", "token_type", name="uq_reset_token_email_type"),
         Index("ix_reset_token_email_type", "email", "token_type"),
+        Index("ix_reset_token_created_at", "created_at"),
     )
 
     def as_dict(self) -> dict:
+        created, last_sent = self.created_at, self.last_sent_at
         return {
             "id": self.id,
             "email": self.email,
             "token_type": self.token_type,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_sent_at": self.last_sent_at.isoformat() if self.last_sent_at else None,
+            "created_at": created.isoformat() if created else None,
+            "last_sent_at": last_sent.isoformat() if last_sent else None,
         }
 
     def __repr__(self) -> str:  # pragma: no cover
@@ -209,9 +219,6 @@ class ResetPasswordToken(Base):
         )
 
 
-__all__.append("ResetPasswordToken")
-
-
 class MozelloNotificationLog(Base):
     """Audit log of accepted Mozello webhook notifications."""
 
@@ -228,13 +235,21 @@ class MozelloNotificationLog(Base):
     )
 
     def as_dict(self) -> dict:
+        received = self.received_at
         return {
             "id": self.id,
-            "received_at": self.received_at.isoformat() if self.received_at else None,
+            "received_at": received.isoformat() if received else None,
             "event": self.event,
             "outcome": self.outcome,
             "payload_json": self.payload_json,
         }
 
 
-__all__.append("MozelloNotificationLog")
+__all__ = [
+    "Base",
+    "MozelloOrder",
+    "MozelloConfig",
+    "EmailTemplate",
+    "ResetPasswordToken",
+    "MozelloNotificationLog",
+]
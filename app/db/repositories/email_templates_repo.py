@@ -1,61 +1,119 @@
 """Repository helpers for stored email templates."""
 from __future__ import annotations
 
-from typing import List, Optional
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
-from sqlalchemy import text
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.db import plugin_session
-from app.db.engine import get_engine
 from app.db.models import EmailTemplate
 from app.utils.logging import get_logger
 
 LOG = get_logger("email_templates_repo")
-_SUBJECT_COLUMN_READY = False
-
-
-def _ensure_subject_column() -> None:
-    global _SUBJECT_COLUMN_READY
-    if _SUBJECT_COLUMN_READY:
-        return
-    try:
-        engine = get_engine()
-        with engine.begin() as conn:  # type: ignore[assignment]
-            columns = [row[1] for row in conn.execute(text("PRAGMA table_info(email_templates)"))]
-            if "subject" not in columns:
-                LOG.info("Adding email_templates.subject column")
-                conn.execute(
-                    text(
-                        "ALTER TABLE email_templates "
-                        "ADD COLUMN subject VARCHAR(255) NOT NULL DEFAULT ''"
-                    )
-                )
-    except Exception as exc:  # pragma: no cover - best-effort guard
-        LOG.error("Email templates schema migration failed: %s", exc)
-    finally:
-        _SUBJECT_COLUMN_READY = True
-
-
-def get_template(template_key: str, language: str) -> Optional[EmailTemplate]:
-    _ensure_subject_column()
+
+# Templates are read for every outbound email but change only when an admin
+# saves one. Immutable rows are cached per (template_key, language), None for
+# missing ones. upsert_template clears this worker's cache; other gunicorn
+# workers pick up an edit or a new template once the short TTL expires.
+_TEMPLATE_CACHE: Dict[Tuple[str, str], Tuple[Optional["TemplateRow"], float]] = {}
+_TEMPLATE_CACHE_TTL = 30.0  # seconds
+_TEMPLATE_CACHE_LOCK = threading.Lock()
+# Bumped by every invalidation; a load that started before one does not store
+# its (possibly pre-edit) rows.
+_TEMPLATE_CACHE_GENERATION = 0
+
+
+@dataclass(frozen=True, slots=True)
+class TemplateRow:
+    """Read-only template content, safe to share between threads."""
+
+    template_key: str
+    language: str
+    subject: str
+    html_body: str
+    updated_at: Optional[datetime]
+
+
+_TEMPLATE_ROW_COLUMNS = (
+    EmailTemplate.template_key,
+    EmailTemplate.language,
+    EmailTemplate.subject,
+    EmailTemplate.html_body,
+    EmailTemplate.updated_at,
+)
+
+
+def get_template(template_key: str, language: str) -> Optional[TemplateRow]:
+    return get_templates([(template_key, language)]).get((template_key, language))
+
+
+def get_templates(pairs: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], TemplateRow]:
+    """Fetch several ``(template_key, language)`` templates in one query.
+
+    Returns a dict keyed by the pair; missing templates are absent. Pairs
+    seen within the cache TTL are answered without touching the DB.
+    """
+    wanted = list(dict.fromkeys((key, language) for key, language in pairs))
+    if not wanted:
+        return {}
+    found: Dict[Tuple[str, str], TemplateRow] = {}
+    missing: List[Tuple[str, str]] = []
+    now = time.monotonic()
+    with _TEMPLATE_CACHE_LOCK:
+        generation = _TEMPLATE_CACHE_GENERATION
+        for pair in wanted:
+            cached = _TEMPLATE_CACHE.get(pair)
+            if cached is None or now - cached[1] >= _TEMPLATE_CACHE_TTL:
+                missing.append(pair)
+            elif cached[0] is not None:
+                found[pair] = cached[0]
+    if not missing:
+        return found
+    stmt = select(*_TEMPLATE_ROW_COLUMNS).where(
+        tuple_(EmailTemplate.template_key, EmailTemplate.language).in_(missing)
+    )
     with plugin_session() as session:
-        return (
-            session.query(EmailTemplate)
-            .filter(
-                EmailTemplate.template_key == template_key,
-                EmailTemplate.language == language,
-            )
-            .one_or_none()
-        )
-
-
-def list_templates(template_key: Optional[str] = None) -> List[EmailTemplate]:
-    _ensure_subject_column()
+        loaded = {
+            (row.template_key, row.language): TemplateRow(*row) for row in session.execute(stmt)
+        }
+    with _TEMPLATE_CACHE_LOCK:
+        if generation == _TEMPLATE_CACHE_GENERATION:
+            for pair in missing:
+                _TEMPLATE_CACHE[pair] = (loaded.get(pair), now)
+    found.update(loaded)
+    return found
+
+
+def invalidate_template_cache() -> None:
+    """Forget cached templates (call after templates change outside this module)."""
+    global _TEMPLATE_CACHE_GENERATION
+    with _TEMPLATE_CACHE_LOCK:
+        _TEMPLATE_CACHE_GENERATION += 1
+        _TEMPLATE_CACHE.clear()
+
+
+def list_templates(
+    template_key: Optional[str] = None,
+    *,
+    columns: Optional[Sequence[Any]] = None,
+) -> List[Any]:
+    """Return stored templates, optionally filtered by key.
+
+    With ``columns`` (``EmailTemplate`` attributes) only those columns are
+    selected and plain rows are returned instead of ORM instances.
+    """
+    stmt = select(*columns) if columns else select(EmailTemplate)
+    if template_key:
+        stmt = stmt.where(EmailTemplate.template_key == template_key)
     with plugin_session() as session:
-        query = session.query(EmailTemplate)
-        if template_key:
-            query = query.filter(EmailTemplate.template_key == template_key)
-        return query.all()
+        if columns:
+            return session.execute(stmt).all()
+        return list(session.scalars(stmt))
 
 
 def upsert_template(
@@ -64,28 +122,33 @@ def upsert_template(
     html_body: str,
     subject: str,
 ) -> EmailTemplate:
-    _ensure_subject_column()
+    """Insert or update the template for ``(template_key, language)`` in one statement."""
+    stmt = sqlite_insert(EmailTemplate).values(
+        template_key=template_key,
+        language=language,
+        html_body=html_body,
+        subject=subject,
+    )
+    # onupdate does not fire for ON CONFLICT updates, so stamp it explicitly.
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["template_key", "language"],
+        set_={
+            "html_body": stmt.excluded.html_body,
+            "subject": stmt.excluded.subject,
+            "updated_at": datetime.utcnow(),
+        },
+    ).returning(EmailTemplate)
     with plugin_session() as session:
-        record = (
-            session.query(EmailTemplate)
-            .filter(
-                EmailTemplate.template_key == template_key,
-                EmailTemplate.language == language,
-            )
-            .one_or_none()
-        )
-        if record:
-            record.html_body = html_body
-            record.subject = subject
-            return record
-        record = EmailTemplate(
-            template_key=template_key,
-            language=language,
-            html_body=html_body,
-            subject=subject,
-        )
-        session.add(record)
-        return record
-
-
-__all__ = ["get_template", "list_templates", "upsert_template"]
+        record = session.scalars(stmt, execution_options={"populate_existing": True}).one()
+    invalidate_template_cache()
+    return record
+
+
+__all__ = [
+    "TemplateRow",
+    "get_template",
+    "get_templates",
+    "invalidate_template_cache",
+    "list_templates",
+    "upsert_template",
+]
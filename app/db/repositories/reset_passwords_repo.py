@@ -4,7 +4,9 @@ from __future__ import annotations
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, lambda_stmt, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.sql import StatementLambdaElement
 
 from app.db import plugin_session
 from app.db.models import ResetPasswordToken
@@ -20,14 +22,15 @@ def _validate_token_type(token_type: str) -> None:
         raise ValueError("invalid_token_type")
 
 
-def _best_effort_prune(session: Session, *, older_than_days: int = _RETENTION_DAYS) -> None:
-    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
-    try:
-        session.query(ResetPasswordToken).filter(ResetPasswordToken.created_at < cutoff).delete(
-            synchronize_session=False
+def _token_stmt(email: str, token_type: str) -> StatementLambdaElement:
+    # Lambda statements are cached by code location, so the SELECT is compiled
+    # once per process; email/token_type become bound parameters.
+    return lambda_stmt(
+        lambda: select(ResetPasswordToken).where(
+            ResetPasswordToken.email == email,
+            ResetPasswordToken.token_type == token_type,
         )
-    except Exception:  # pragma: no cover - defensive guard
-        LOG.warning("Failed pruning reset tokens", exc_info=True)
+    )
 
 
 def upsert_token(
@@ -37,62 +40,41 @@ def upsert_token(
     password_hash: Optional[str] = None,
     last_sent_at: Optional[datetime] = None,
 ) -> ResetPasswordToken:
-    """Create or update the token row for the provided email/type pair."""
+    """Create or update the token row for the provided email/type pair.
+
+    One ``INSERT ... ON CONFLICT DO UPDATE`` statement; a ``None``
+    ``password_hash`` keeps the stored hash of an existing row.
+    """
     _validate_token_type(token_type)
-    now = datetime.utcnow()
+    stmt = sqlite_insert(ResetPasswordToken).values(
+        email=email,
+        token_type=token_type,
+        password_hash=password_hash,
+        last_sent_at=last_sent_at or datetime.utcnow(),
+    )
+    updates = {"last_sent_at": stmt.excluded.last_sent_at}
+    if password_hash is not None:
+        updates["password_hash"] = stmt.excluded.password_hash
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["email", "token_type"],
+        set_=updates,
+    ).returning(ResetPasswordToken)
     with plugin_session() as session:
-        _best_effort_prune(session)
-        record = (
-            session.query(ResetPasswordToken)
-            .filter(
-                ResetPasswordToken.email == email,
-                ResetPasswordToken.token_type == token_type,
-            )
-            .one_or_none()
-        )
-        if record:
-            if password_hash is not None:
-                record.password_hash = password_hash
-            record.last_sent_at = last_sent_at or now
-            return record
-        record = ResetPasswordToken(
-            email=email,
-            token_type=token_type,
-            password_hash=password_hash,
-            last_sent_at=last_sent_at or now,
-        )
-        session.add(record)
-        return record
+        return session.scalars(stmt, execution_options={"populate_existing": True}).one()
 
 
 def get_token(*, email: str, token_type: str) -> Optional[ResetPasswordToken]:
     """Fetch a token row by email/type, returning None when missing."""
     _validate_token_type(token_type)
     with plugin_session() as session:
-        _best_effort_prune(session)
-        return (
-            session.query(ResetPasswordToken)
-            .filter(
-                ResetPasswordToken.email == email,
-                ResetPasswordToken.token_type == token_type,
-            )
-            .one_or_none()
-        )
+        return session.execute(_token_stmt(email, token_type)).scalar_one_or_none()
 
 
 def delete_token(*, email: str, token_type: str) -> bool:
     """Delete the stored token row if it exists."""
     _validate_token_type(token_type)
     with plugin_session() as session:
-        _best_effort_prune(session)
-        record = (
-            session.query(ResetPasswordToken)
-            .filter(
-                ResetPasswordToken.email == email,
-                ResetPasswordToken.token_type == token_type,
-            )
-            .one_or_none()
-        )
+        record = session.execute(_token_stmt(email, token_type)).scalar_one_or_none()
         if not record:
             return False
         session.delete(record)
@@ -100,17 +82,16 @@ def delete_token(*, email: str, token_type: str) -> bool:
 
 
 def purge_expired_tokens(*, older_than_days: int = _RETENTION_DAYS) -> int:
-    """Force a pruning pass for tokens older than the provided retention window."""
+    """Delete tokens older than the retention window (run by the periodic sweep)."""
     if older_than_days <= 0:
         raise ValueError("older_than_days_positive")
     cutoff = datetime.utcnow() - timedelta(days=older_than_days)
     with plugin_session() as session:
-        deleted = (
-            session.query(ResetPasswordToken)
-            .filter(ResetPasswordToken.created_at < cutoff)
-            .delete(synchronize_session=False)
+        result = session.execute(
+            lambda_stmt(lambda: delete(ResetPasswordToken).where(ResetPasswordToken.created_at < cutoff)),
+            execution_options={"synchronize_session": False},
         )
-        return int(deleted or 0)
+        return int(result.rowcount or 0)
 
 
 __all__ = [
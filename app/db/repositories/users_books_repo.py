@@ -1,11 +1,13 @@
 """Repository helpers for Mozello order records (users_books DB)."""
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable, List, Optional
+from typing import Iterable, List, Optional, Tuple
 
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import or_
+from sqlalchemy import bindparam, func, or_, select, update
 
 from app.db import plugin_session
 from app.db.models import MozelloOrder
@@ -15,6 +17,19 @@ class OrderExistsError(Exception):
     """Raised when attempting to insert a duplicate (email, mz_handle) pair."""
 
 
+@dataclass(frozen=True, slots=True)
+class OrderRow:
+    """Read-only order row without ORM instance state (see :func:`list_order_rows`)."""
+
+    id: int
+    email: str
+    mz_handle: str
+    calibre_user_id: Optional[int]
+    calibre_book_id: Optional[int]
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+
 def list_orders() -> List[MozelloOrder]:
     with plugin_session() as session:
         return (
@@ -24,6 +39,25 @@ def list_orders() -> List[MozelloOrder]:
         )
 
 
+def list_order_rows() -> List[OrderRow]:
+    """Column projection of :func:`list_orders` for read-only callers.
+
+    Rows skip the identity map and per-instance ORM state, which matters when
+    the admin list or an import scans every order.
+    """
+    with plugin_session() as session:
+        rows = session.query(
+            MozelloOrder.id,
+            MozelloOrder.email,
+            MozelloOrder.mz_handle,
+            MozelloOrder.calibre_user_id,
+            MozelloOrder.calibre_book_id,
+            MozelloOrder.created_at,
+            MozelloOrder.updated_at,
+        ).order_by(MozelloOrder.created_at.desc(), MozelloOrder.id.desc())
+        return [OrderRow(*row) for row in rows]
+
+
 def get_order(order_id: int) -> Optional[MozelloOrder]:
     with plugin_session() as session:
         return session.query(MozelloOrder).filter(MozelloOrder.id == order_id).one_or_none()
@@ -67,6 +101,38 @@ def create_order(
     return order
 
 
+def create_orders(
+    rows: Iterable[Tuple[str, str, Optional[int], Optional[int], Optional[datetime]]],
+    *,
+    imported_at: datetime,
+) -> List[Tuple[int, str, str]]:
+    """Insert ``(email, mz_handle, user_id, book_id, created_at)`` rows in one statement.
+
+    Pairs that already exist are skipped (``ON CONFLICT DO NOTHING``) instead
+    of failing the batch. Returns ``(id, email, mz_handle)`` for inserted rows.
+    """
+    values = [
+        {
+            "email": email,
+            "mz_handle": mz_handle,
+            "calibre_user_id": calibre_user_id,
+            "calibre_book_id": calibre_book_id,
+            "created_at": created_at or imported_at,
+            "updated_at": imported_at,
+        }
+        for email, mz_handle, calibre_user_id, calibre_book_id, created_at in rows
+    ]
+    if not values:
+        return []
+    stmt = (
+        sqlite_insert(MozelloOrder)
+        .on_conflict_do_nothing(index_elements=["email", "mz_handle"])
+        .returning(MozelloOrder.id, MozelloOrder.email, MozelloOrder.mz_handle)
+    )
+    with plugin_session() as session:
+        return [tuple(row) for row in session.execute(stmt, values)]
+
+
 def update_links(
     order_id: int,
     calibre_user_id: Optional[int] = None,
@@ -84,18 +150,29 @@ def update_links(
 
 
 def bulk_update_links(updates: Iterable[tuple[int, Optional[int], Optional[int]]]) -> None:
-    updates_list = list(updates)
-    if not updates_list:
+    """Apply ``(order_id, user_id, book_id)`` link updates in one executemany UPDATE.
+
+    ``None`` leaves the stored value untouched. Duplicate order ids collapse to
+    the last entry and rows are written in id order.
+    """
+    latest = {order_id: (user_id, book_id) for order_id, user_id, book_id in updates}
+    if not latest:
         return
+    params = [
+        {"b_id": order_id, "b_user": user_id, "b_book": book_id}
+        for order_id, (user_id, book_id) in sorted(latest.items())
+    ]
+    table = MozelloOrder.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("b_id"))
+        .values(
+            calibre_user_id=func.coalesce(bindparam("b_user"), table.c.calibre_user_id),
+            calibre_book_id=func.coalesce(bindparam("b_book"), table.c.calibre_book_id),
+        )
+    )
     with plugin_session() as session:
-        for order_id, user_id, book_id in updates_list:
-            order = session.query(MozelloOrder).filter(MozelloOrder.id == order_id).one_or_none()
-            if not order:
-                continue
-            if user_id is not None:
-                order.calibre_user_id = user_id
-            if book_id is not None:
-                order.calibre_book_id = book_id
+        session.connection().execute(stmt, params)
 
 
 def mark_imported(
@@ -133,15 +210,19 @@ def delete_order(order_id: int) -> bool:
 
 __all__ = [
     "OrderExistsError",
+    "OrderRow",
     "list_orders",
+    "list_order_rows",
     "get_order",
     "get_order_by_email_handle",
     "create_order",
+    "create_orders",
     "update_links",
     "bulk_update_links",
     "mark_imported",
     "delete_order",
     "list_orders_for_user",
+    "list_order_links_for_user",
 ]
 
 
@@ -161,3 +242,31 @@ def list_orders_for_user(
     with plugin_session() as session:
         query = session.query(MozelloOrder).filter(or_(*filters))
         return query.all()
+
+
+# Built once so every catalog state load reuses one cached compiled form; a
+# NULL parameter never matches its ``=`` comparison, so absent identities are
+# simply ignored instead of changing the statement shape.
+_ORDER_LINKS_STMT = select(MozelloOrder.calibre_book_id, MozelloOrder.mz_handle).where(
+    or_(
+        MozelloOrder.calibre_user_id == bindparam("uid"),
+        MozelloOrder.email == bindparam("email"),
+    )
+)
+
+
+def list_order_links_for_user(
+    *,
+    calibre_user_id: Optional[int] = None,
+    email: Optional[str] = None,
+) -> List[Tuple[Optional[int], str]]:
+    """Return ``(calibre_book_id, mz_handle)`` pairs for the user's orders.
+
+    Column projection of :func:`list_orders_for_user` for callers that only
+    need the book links; no ORM instances are built.
+    """
+    if calibre_user_id is None and not email:
+        return []
+    params = {"uid": calibre_user_id, "email": email or None}
+    with plugin_session() as session:
+        return [tuple(row) for row in session.execute(_ORDER_LINKS_STMT, params)]
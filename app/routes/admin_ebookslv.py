@@ -30,13 +30,9 @@ except Exception:  # pragma: no cover
     def generate_csrf():  # type: ignore
         return ""
 
-try:  # runtime dependency on Calibre-Web
-    from cps.render_template import render_title_template as _cw_render_title_template  # type: ignore
-except Exception:  # pragma: no cover - allow tests without Calibre runtime
-    _cw_render_title_template = None  # type: ignore
-
 from app.config import app_title
-from app.utils import ensure_admin, PermissionError
+from app.utils import admin_guard, ensure_admin, PermissionError
+from app.utils.json_response import json_response, ndjson_response
 from app.utils.logging import get_logger
 from app.services.calibre_defaults_service import apply_ebookslv_default_settings, CalibreRuntimeUnavailable
 try:  # pragma: no cover - Flask-Babel optional in tests
@@ -140,29 +136,51 @@ def _require_admin():
     return _ensure_admin(prefer_redirect=True)
 
 
+_admin_page = admin_guard(_require_admin)  # redirects anonymous users to login
+_admin_api = admin_guard(lambda: _ensure_admin(prefer_redirect=False))  # JSON 403 for API callers
+
+
+# Calibre-Web's render_title_template, set by the first successful lookup.
+_cw_render_title_template = None
+
+
+def _cw_title_renderer():
+    """Return Calibre-Web's title renderer, or None while it cannot be imported.
+
+    Only a successful import is remembered, so a Calibre runtime that is not
+    ready yet is retried on the next admin page instead of being given up on.
+    """
+    global _cw_render_title_template
+    if _cw_render_title_template is None:
+        try:
+            from cps.render_template import render_title_template  # type: ignore
+        except Exception as exc:  # pragma: no cover - allow tests without Calibre runtime
+            LOG.debug("Calibre-Web title renderer unavailable: %s", exc)
+            return None
+        _cw_render_title_template = render_title_template
+    return _cw_render_title_template
+
+
 def _render_admin_page(template_name: str, **context):
     """Render admin pages with the same context Calibre-Web uses (instance + sidebar)."""
-    if _cw_render_title_template:  # type: ignore[truthy-bool]
+    renderer = _cw_title_renderer()
+    if renderer is not None:
         try:
-            return _cw_render_title_template(template_name, **context)  # type: ignore[misc]
-        except Exception:
-            pass
+            return renderer(template_name, **context)
+        except Exception as exc:
+            LOG.debug("Calibre-Web title render failed template=%s: %s", template_name, exc)
     return render_template(template_name, **context)
 
 
 @bp.route("/", methods=["GET"])  # /admin/ebookslv/
+@_admin_page
 def landing():  # pragma: no cover - thin render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     return _render_admin_page("ebookslv_admin.html", ub_csrf_token=generate_csrf())
 
 
 @bp.route("/orders/", methods=["GET"])
+@_admin_page
 def orders_page():  # pragma: no cover - thin render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     return _render_admin_page("orders_admin.html", ub_csrf_token=generate_csrf())
 
 
@@ -179,10 +197,8 @@ def _computed_webhook_url() -> Optional[str]:
 
 
 @bp.route("/mozello/", methods=["GET"])
+@_admin_page
 def mozello_page():  # pragma: no cover - thin render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     candidate = _computed_webhook_url()
     ctx = {
         "notifications_url": candidate,
@@ -218,10 +234,8 @@ def _preferred_language_code() -> str:
 
 
 @bp.route("/operator-manual/", methods=["GET"])
+@_admin_page
 def operator_manual_page():  # pragma: no cover - thin render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     lang = _preferred_language_code()
     manual_html = operator_manual_service.render_operator_manual_html(lang)
     return _render_admin_page(
@@ -231,18 +245,14 @@ def operator_manual_page():  # pragma: no cover - thin render wrapper
 
 
 @bp.route("/books/", methods=["GET"])
+@_admin_page
 def books_page():  # pragma: no cover - thin render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     return _render_admin_page("ebookslv_books_admin.html")
 
 
 @bp.route("/email-templates/", methods=["GET"])
+@_admin_page
 def email_templates_page():  # pragma: no cover - render wrapper
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     context = fetch_templates_context()
     return _render_admin_page(
         "email_templates_admin.html",
@@ -272,28 +282,17 @@ def _json_error(
     return jsonify(payload), status
 
 
-def _require_admin_json():
-    auth = _ensure_admin(prefer_redirect=False)
-    if auth is not True:
-        return auth
-    return True
-
-
 @bp.route("/orders/api/list", methods=["GET"])
+@_admin_api
 def api_orders_list():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     data = orders_service.list_orders()
-    return jsonify(data)
+    return json_response(data, conditional=True)
 
 
 @bp.route("/apply_defaults", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_apply_defaults():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     try:
         result = apply_ebookslv_default_settings()
     except CalibreRuntimeUnavailable as exc:
@@ -312,10 +311,8 @@ def api_apply_defaults():
 
 @bp.route("/orders/api/create", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_orders_create():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     payload = request.get_json(silent=True) or {}
     try:
         result = orders_service.create_order(payload.get("email"), payload.get("mz_handle"))
@@ -328,10 +325,8 @@ def api_orders_create():
 
 @bp.route("/orders/api/<int:order_id>/create_user", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_orders_create_user(order_id: int):
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     try:
         result = orders_service.create_user_for_order(order_id)
     except orders_service.OrderNotFoundError:
@@ -345,10 +340,8 @@ def api_orders_create_user(order_id: int):
 
 @bp.route("/orders/api/<int:order_id>/refresh", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_orders_refresh(order_id: int):
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     try:
         result = orders_service.refresh_order(order_id)
     except orders_service.OrderNotFoundError:
@@ -358,10 +351,8 @@ def api_orders_refresh(order_id: int):
 
 @bp.route("/orders/api/import_paid", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_orders_import_paid():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     payload = request.get_json(silent=True) or {}
     try:
         result = orders_service.import_paid_orders(
@@ -382,10 +373,8 @@ def api_orders_import_paid():
 
 @bp.route("/orders/api/<int:order_id>", methods=["DELETE"])
 @_maybe_exempt
+@_admin_api
 def api_orders_delete(order_id: int):
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     try:
         result = orders_service.delete_order(order_id)
     except orders_service.OrderNotFoundError:
@@ -394,12 +383,13 @@ def api_orders_delete(order_id: int):
 
 
 @bp.route("/books/api/data", methods=["GET"])  # list calibre only
+@_admin_api
 def api_books_data():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
+    if request.args.get("stream"):
+        # ?stream=1: one book per line for exports of large libraries.
+        return ndjson_response(books_sync.iter_calibre_books())
     rows = books_sync.list_calibre_books()
-    return jsonify({"rows": rows, "source": "calibre"})
+    return json_response({"rows": rows, "source": "calibre"}, conditional=True)
 
 
 _PRODUCT_CACHE = {"loaded": False, "products": []}
@@ -454,10 +444,8 @@ def _merge_products(calibre_rows, products):
 
 @bp.route("/books/api/load_products", methods=["POST"])  # merge mozello
 @_maybe_exempt
+@_admin_api
 def api_books_load_products():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     calibre_rows = books_sync.list_calibre_books()
     ok, data = mozello_service.list_products_full()
     if not ok:
@@ -482,15 +470,13 @@ def api_books_load_products():
     merged = _merge_products(calibre_rows, products)
     _PRODUCT_CACHE["loaded"] = True
     _PRODUCT_CACHE["products"] = products
-    return jsonify({"rows": merged, "products": len(products), "orphans": len([r for r in merged if r.get("orphan")])})
+    return json_response({"rows": merged, "products": len(products), "orphans": len([r for r in merged if r.get("orphan")])})
 
 
 @bp.route("/books/api/sync_prices_from_mozello", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_sync_prices_from_mozello():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     calibre_rows = books_sync.list_calibre_books()
     by_handle = {r.get("mz_handle"): r for r in calibre_rows if r.get("mz_handle")}
     ok, data = mozello_service.list_products_full()
@@ -518,15 +504,13 @@ def api_sync_prices_from_mozello():
         if books_sync.set_mz_price_for_handle(handle, price_value):
             row["mz_price"] = price_value
             updated += 1
-    return jsonify({"status": "ok", "updated": updated, "missing_price": missing_price, "orphans": orphans, "rows": calibre_rows})
+    return json_response({"status": "ok", "updated": updated, "missing_price": missing_price, "orphans": orphans, "rows": calibre_rows})
 
 
 @bp.route("/books/api/push_prices_to_mozello", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_push_prices_to_mozello():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     calibre_rows = books_sync.list_calibre_books()
     handles_with_price = [r for r in calibre_rows if r.get("mz_handle") and r.get("mz_price") is not None]
     ok_products, data = mozello_service.list_products_full()
@@ -562,10 +546,8 @@ def api_push_prices_to_mozello():
 
 @bp.route("/books/api/export_one/<int:book_id>", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_books_export_one(book_id: int):
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     # find book
     rows = books_sync.list_calibre_books()
     target = next((r for r in rows if r["book_id"] == book_id), None)
@@ -643,10 +625,8 @@ def api_books_export_one(book_id: int):
 
 @bp.route("/books/api/export_all", methods=["POST"])  # create/update all missing handles
 @_maybe_exempt
+@_admin_api
 def api_books_export_all():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     rows = books_sync.list_calibre_books()
     def _has_positive_price(value: Any) -> bool:
         if value is None:
@@ -722,10 +702,8 @@ def api_books_export_all():
 
 @bp.route("/books/api/delete/<handle>", methods=["DELETE"])  # delete product (or orphan)
 @_maybe_exempt
+@_admin_api
 def api_books_delete(handle: str):
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     ok, resp = mozello_service.delete_product(handle)
     if not ok:
         code = resp.get("error", "delete_failed") if isinstance(resp, dict) else "delete_failed"
@@ -741,20 +719,16 @@ def api_books_delete(handle: str):
 
 
 @bp.route("/email-templates/api/list", methods=["GET"])
+@_admin_api
 def api_email_templates_list():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     data = fetch_templates_context()
     return jsonify(data)
 
 
 @bp.route("/email-templates/api/save", methods=["POST"])
 @_maybe_exempt
+@_admin_api
 def api_email_templates_save():
-    auth = _require_admin_json()
-    if auth is not True:
-        return auth
     payload = request.get_json(silent=True) or {}
     try:
         view = save_email_template(
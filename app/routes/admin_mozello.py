@@ -24,7 +24,7 @@ except Exception:  # pragma: no cover
         def abort(*a, **k):  # type: ignore
             raise RuntimeError("Flask not available")
 
-from app.utils import ensure_admin, PermissionError
+from app.utils import admin_guard, ensure_admin, PermissionError
 try:  # pragma: no cover - Flask-Babel optional in tests
     from flask_babel import gettext as _  # type: ignore
 except Exception:  # pragma: no cover
@@ -46,6 +46,7 @@ from app.services import (
     CalibreUnavailableError,
     books_sync,
 )
+from app import config as app_config
 from app.utils.logging import get_logger
 from app.i18n.preferences import SESSION_LOCALE_KEY
 
@@ -118,6 +119,10 @@ def _require_admin():
         return _json_error("permission_denied", 403, message=str(exc))
     return True
 
+
+_admin_required = admin_guard(_require_admin)
+
+
 def _computed_webhook_url() -> Optional[str]:
     """Compute candidate webhook URL using current request host.
 
@@ -138,10 +143,8 @@ def _computed_webhook_url() -> Optional[str]:
         return None
 
 @bp.route("/", methods=["GET"])  # UI page
+@_admin_required
 def mozello_admin_page():  # pragma: no cover (thin render)
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     return redirect("/admin/ebookslv/mozello/")
 @webhook_bp.route("/mozello/books/<path:mz_handle>", methods=["GET"])
 def mozello_product_redirect(mz_handle: str):
@@ -172,16 +175,13 @@ def mozello_product_redirect(mz_handle: str):
 
 
 @bp.route("/product/<path:mz_handle>", methods=["GET"])
+@_admin_required
 def mozello_debug_product(mz_handle: str):
     """Admin-only debug helper: fetch product JSON and show URL fields.
 
     This is intentionally a JSON endpoint (no UI) so admins can confirm whether
     Mozello returns different URLs per language.
     """
-    auth = _require_admin()
-    if auth is not True:
-        return auth
-
     handle = (mz_handle or "").strip()
     if handle.isdigit():
         lookup = books_sync.get_mz_handle_for_book(int(handle))
@@ -238,19 +238,15 @@ def mozello_debug_product(mz_handle: str):
 
 
 @bp.route("/app_settings", methods=["GET"])
+@_admin_required
 def mozello_get_app_settings():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     return jsonify(mozello_service.get_app_settings())
 
 
 @bp.route("/app_settings", methods=["PUT"])
 @_maybe_exempt
+@_admin_required
 def mozello_update_app_settings():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     data: Dict[str, Any] = request.get_json(silent=True) or {}
     try:
         updated = mozello_service.update_app_settings(
@@ -265,10 +261,8 @@ def mozello_update_app_settings():
     return jsonify(updated)
 
 @bp.route("/settings", methods=["GET"])
+@_admin_required
 def mozello_get_settings():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     ok, remote = mozello_service.fetch_remote_notifications()
     candidate = _computed_webhook_url()
     data = {
@@ -282,10 +276,8 @@ def mozello_get_settings():
 
 @bp.route("/settings", methods=["PUT"])
 @_maybe_exempt
+@_admin_required
 def mozello_update_settings():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     data: Dict[str, Any] = request.get_json(silent=True) or {}
     events = data.get("notifications_wanted") or []
     if not isinstance(events, list):
@@ -306,8 +298,8 @@ def mozello_update_settings():
 @_maybe_exempt
 def mozello_webhook():
     raw = request.get_data()
-    headers = {k: v for k, v in request.headers.items()}
-    ok, event_name, payload = mozello_service.handle_webhook(raw, headers)
+    # Request headers are already a case-insensitive mapping; no copy needed.
+    ok, event_name, payload = mozello_service.handle_webhook(raw, request.headers)
     if not ok:
         LOG.warning("Mozello webhook rejected reason=%s remote=%s", event_name, getattr(request, "remote_addr", None))
         return jsonify({"status": "rejected", "reason": event_name}), 400
@@ -316,18 +308,20 @@ def mozello_webhook():
     data = payload if isinstance(payload, dict) else {}
     order_data = data.get("order") if isinstance(data.get("order"), dict) else None
 
+    raw_text = raw.decode("utf-8", errors="replace")
+
     def _maybe_log(outcome: str) -> None:
         try:
             mozello_notifications_log_service.append_log(
                 event=event_upper,
                 outcome=outcome,
-                payload_raw=mozello_notifications_log_service.coerce_payload_to_text(raw),
+                payload_raw=raw_text,
             )
         except Exception:
             # Never break webhook processing due to logging.
             LOG.debug("Mozello notifications log append failed", exc_info=True)
 
-    _dump_webhook_event(event_upper, data or {}, raw)
+    _dump_webhook_event(event_upper, data or {}, raw_text)
 
     if event_upper == "PRODUCT_CHANGED":
         product_data = data.get("product") if isinstance(data.get("product"), dict) else None
@@ -454,10 +448,8 @@ def mozello_webhook():
 
 
 @bp.route("/notifications_log", methods=["GET"])
+@_admin_required
 def mozello_get_notifications_log():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     try:
         limit_raw = request.args.get("limit")
         limit = int(limit_raw) if isinstance(limit_raw, str) and limit_raw.strip().isdigit() else 50
@@ -468,10 +460,8 @@ def mozello_get_notifications_log():
 
 @bp.route("/notifications_log", methods=["PUT"])
 @_maybe_exempt
+@_admin_required
 def mozello_update_notifications_log_settings():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     data: Dict[str, Any] = request.get_json(silent=True) or {}
     enabled = bool(data.get("enabled"))
     try:
@@ -483,10 +473,8 @@ def mozello_update_notifications_log_settings():
 
 @bp.route("/notifications_log", methods=["DELETE"])
 @_maybe_exempt
+@_admin_required
 def mozello_clear_notifications_log():
-    auth = _require_admin()
-    if auth is not True:
-        return auth
     try:
         deleted = mozello_notifications_log_service.clear_logs()
     except Exception as exc:
@@ -513,9 +501,9 @@ def register_blueprints(app):
 __all__ = ["register_blueprints"]
 
 
-def _dump_webhook_event(event: str, payload: Dict[str, Any], raw_body: bytes) -> None:
+def _dump_webhook_event(event: str, payload: Dict[str, Any], raw_text: str) -> None:
     """Persist webhook payload to disk when dump path configured."""
-    dump_root = os.getenv("MOZELLO_WEBHOOK_DUMP_PATH", "").strip()
+    dump_root = app_config.mozello_webhook_dump_path()
     if not dump_root:
         return
     if event.upper() not in _ALL_WEBHOOK_EVENTS:
@@ -529,7 +517,7 @@ def _dump_webhook_event(event: str, payload: Dict[str, Any], raw_body: bytes) ->
             "event": event or "UNKNOWN",
             "received_at": datetime.utcnow().isoformat() + "Z",
             "payload": payload,
-            "raw_body": raw_body.decode("utf-8", errors="replace"),
+            "raw_body": raw_text,
         }
         with open(file_path, "w", encoding="utf-8") as handle:
             json.dump(dump_payload, handle, indent=2, sort_keys=True)
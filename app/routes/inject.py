@@ -32,6 +32,7 @@ from app.routes.overrides.mozello_sync_injection import register_mozello_sync_in
 from app.routes.overrides.mozello_theme_injection import register_mozello_theme_injection
 from app.routes.overrides.mz_pictures_gallery_injection import register_mz_pictures_gallery_injection
 from app.routes.overrides.mozello_csp_img_src_injection import register_mozello_csp_img_src_injection
+from app.routes.overrides.static_gzip import register_static_gzip
 
 def _ensure_nav_injection(app: Any) -> None:
     """Register both loader and response nav injection handlers."""
@@ -46,6 +47,9 @@ def _ensure_nav_injection(app: Any) -> None:
 
 
 def register_all(app: Any) -> None:
+    # after_request hooks run in reverse order; registering first makes static
+    # compression the last step applied to a response.
+    register_static_gzip(app)
     # Register our admin blueprint & navigation injection.
     register_login_override(app)
     register_language_switch(app)
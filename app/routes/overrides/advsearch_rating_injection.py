@@ -17,11 +17,10 @@ def _should_inject(response: Response) -> bool:
     ctype = (response.headers.get("Content-Type") or "").lower()
     if "text/html" not in ctype:
         return False
-    body = response.get_data(as_text=False)
-    if not body:
-        return False
     # Only the advanced search form page.
-    return (request.path or "") == "/advsearch"
+    if (request.path or "") != "/advsearch":
+        return False
+    return bool(response.get_data(as_text=False))
 
 
 def _user_has_ratings_section() -> bool:
@@ -40,10 +39,10 @@ def _user_has_ratings_section() -> bool:
 
 
 def _inject_disable_rating_filter(response: Response) -> None:
-    body_text = response.get_data(as_text=True)
-    if not body_text or "ratinghigh" not in body_text:
+    body = response.get_data()
+    if not body or b"ratinghigh" not in body:
         return
-    if "data-eblv-disable-advsearch-rating" in body_text:
+    if b"data-eblv-disable-advsearch-rating" in body or b"</body>" not in body:
         return
 
     script = """
@@ -74,9 +73,8 @@ def _inject_disable_rating_filter(response: Response) -> None:
 </script>
 """.strip()
 
-    if "</body>" in body_text:
-        body_text = body_text.replace("</body>", script + "</body>", 1)
-        response.set_data(body_text)
+    body_text = body.decode().replace("</body>", script + "</body>", 1)
+    response.set_data(body_text)
 
 
 def register_advsearch_rating_injection(app: Any) -> None:
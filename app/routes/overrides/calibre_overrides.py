@@ -36,8 +36,8 @@ def _patch_common_filters() -> None:
 	def _patched(self, allow_show_archived: bool = False, return_all_languages: bool = False):  # type: ignore[override]
 		base_clause = original(self, allow_show_archived, return_all_languages)
 		try:
-			scope = getattr(g, "catalog_scope", CatalogScope.ALL)
-			state = getattr(g, "catalog_state", None)
+			scope = g.get("catalog_scope", CatalogScope.ALL)
+			state = g.get("catalog_state")
 		except RuntimeError:  # outside request context
 			return base_clause
 		if scope == CatalogScope.PURCHASED:
@@ -46,14 +46,14 @@ def _patch_common_filters() -> None:
 			ids = state.purchased_book_ids
 			if not ids:
 				return and_(base_clause, false())
-			return and_(base_clause, Books.id.in_(sorted(ids)))
+			return and_(base_clause, Books.id.in_(ids))
 		if scope == CatalogScope.FREE:
 			if not isinstance(state, UserCatalogState):
 				return and_(base_clause, false())
 			free_ids = state.free_book_ids
 			if not free_ids:
 				return and_(base_clause, false())
-			return and_(base_clause, Books.id.in_(sorted(free_ids)))
+			return and_(base_clause, Books.id.in_(free_ids))
 		return base_clause
 
 	CalibreDB.common_filters = _patched  # type: ignore[assignment]
@@ -98,7 +98,7 @@ def _patch_read_book_access(app: Any) -> None:
 
 	def _can_view_free(book_id: Any) -> bool:
 		try:
-			state = getattr(flask_g, "catalog_state", None)
+			state = flask_g.get("catalog_state")
 			exists = state is not None and hasattr(state, "is_free")
 			return bool(exists and state.is_free(book_id))  # type: ignore[attr-defined]
 		except Exception:
@@ -158,7 +158,7 @@ def _patch_serve_book_access(app: Any) -> None:
 
 	def _can_view_free(book_id: Any) -> bool:
 		try:
-			state = getattr(flask_g, "catalog_state", None)
+			state = flask_g.get("catalog_state")
 			exists = state is not None and hasattr(state, "is_free")
 			return bool(exists and state.is_free(book_id))  # type: ignore[attr-defined]
 		except Exception:
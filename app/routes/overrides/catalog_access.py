@@ -144,6 +144,11 @@ _REWRITE_TOP_LEVEL_PAGES = {
 }
 
 _ATTR_REWRITE_RE = re.compile(r"(?P<attr>href|data-back)=(?P<q>['\"])(?P<url>/[^'\"]*)(?P=q)")
+_DIV_TOKEN_RE = re.compile(r"<div\b|</div>", re.IGNORECASE)
+_UL_OPEN_RE = re.compile(r"<ul(?P<attrs>[^>]*)>", re.IGNORECASE)
+# Intention.js markers: the bare ``intent`` flag and any ``in-*="..."`` attribute.
+_INTENT_ATTR_RE = re.compile(r"\s(?:intent\b|in-[a-zA-Z-]+=(\"[^\"]*\"|'[^']*'))")
+_WHITESPACE_RE = re.compile(r"\s+")
 
 
 def _find_matching_div_end(html: str, start_index: int) -> Optional[int]:
@@ -155,10 +160,9 @@ def _find_matching_div_end(html: str, start_index: int) -> Optional[int]:
 
     if start_index < 0 or start_index >= len(html):
         return None
-    token_re = re.compile(r"<div\b|</div>", re.IGNORECASE)
     depth = 0
     started = False
-    for match in token_re.finditer(html, start_index):
+    for match in _DIV_TOKEN_RE.finditer(html, start_index):
         token = match.group(0).lower()
         if token.startswith("<div") and not token.startswith("</"):
             depth += 1
@@ -180,8 +184,8 @@ def _inject_archived_purchased_section(response: Response) -> None:
     """
 
     try:
-        scope = getattr(g, "catalog_scope", CatalogScope.ALL)
-        state = getattr(g, "catalog_state", None)
+        scope = g.get("catalog_scope", CatalogScope.ALL)
+        state = g.get("catalog_state")
     except Exception:
         return
     if scope != CatalogScope.PURCHASED:
@@ -193,8 +197,8 @@ def _inject_archived_purchased_section(response: Response) -> None:
     if matched != "/catalog/my-books":
         return
 
-    body_text = response.get_data(as_text=True)
-    if not body_text or "data-eblv-archived-section" in body_text:
+    body = response.get_data()
+    if not body or b"data-eblv-archived-section" in body:
         return
 
     entries = archived_books_service.list_archived_purchased_entries(
@@ -214,6 +218,7 @@ def _inject_archived_purchased_section(response: Response) -> None:
 
     # Insert right after the main discover load-more container from index.html.
     marker = '<div class="discover load-more">'
+    body_text = body.decode()
     start = body_text.find(marker)
     if start == -1:
         return
@@ -238,13 +243,14 @@ def _inject_scope_header(response: Response, payload: dict[str, Any], scope: Cat
     if scope not in {CatalogScope.FREE, CatalogScope.PURCHASED}:
         return
 
-    body_text = response.get_data(as_text=True)
-    if not body_text:
+    body = response.get_data()
+    if not body:
         return
 
     # If already injected (or rendered by a previous pass), do nothing.
-    if "eblv-scope-title" in body_text:
+    if b"eblv-scope-title" in body:
         return
+    body_text = body.decode()
 
     scope_labels = payload.get("scope_labels") or {}
     title_text = (
@@ -305,30 +311,27 @@ def _inject_scope_sidebar_nav(response: Response, payload: dict[str, Any]) -> No
     This prevents visible layout shift caused by client-side DOM insertion.
     """
 
-    body_text = response.get_data(as_text=True)
-    if not body_text:
+    body = response.get_data()
+    if not body:
         return
 
     # Only inject if sidebar exists.
-    if 'id="scnd-nav"' not in body_text and "id='scnd-nav'" not in body_text:
+    if b'id="scnd-nav"' not in body and b"id='scnd-nav'" not in body:
         return
+    body_text = body.decode()
 
     # Prevent Intention.js from re-parenting/rebuilding the sidebar on load.
     # This reduces visible sidebar "jump" when navigating between pages.
     try:
-        ul_re = re.compile(r"<ul(?P<attrs>[^>]*)>", re.IGNORECASE)
-
         def _strip_intent_attrs(match: re.Match[str]) -> str:
             attrs = match.group("attrs")
             if "scnd-nav" not in attrs:
                 return match.group(0)
-            cleaned = attrs
-            cleaned = re.sub(r"\sintent\b", "", cleaned)
-            cleaned = re.sub(r"\sin-[a-zA-Z-]+=(\"[^\"]*\"|'[^']*')", "", cleaned)
-            cleaned = re.sub(r"\s+", " ", cleaned).rstrip()
+            cleaned = _INTENT_ATTR_RE.sub("", attrs)
+            cleaned = _WHITESPACE_RE.sub(" ", cleaned).rstrip()
             return f"<ul{cleaned}>"
 
-        body_text = ul_re.sub(_strip_intent_attrs, body_text)
+        body_text = _UL_OPEN_RE.sub(_strip_intent_attrs, body_text)
     except Exception:
         pass
 
@@ -417,7 +420,7 @@ def _login_redirect(next_target: str) -> Response:
 
 
 def _current_catalog_state() -> Optional[UserCatalogState]:
-    state = getattr(g, "catalog_state", None)
+    state = g.get("catalog_state")
     if isinstance(state, UserCatalogState):
         return state
     try:
@@ -576,9 +579,12 @@ def _should_inject(response: Response) -> bool:
 
 
 def _insert_assets(response: Response, payload: dict[str, Any]) -> None:
-    body_text = response.get_data(as_text=True)
-    if not body_text:
+    body = response.get_data()
+    if not body:
+        return
+    if CSS_INJECT_MARKER.encode() in body and CATALOG_STATE_SCRIPT_ID.encode() in body:
         return
+    body_text = body.decode()
     if CSS_INJECT_MARKER not in body_text:
         try:
             css_href = url_for("_app_templates.static", filename="catalog/non_admin_catalog.css")
@@ -724,8 +730,8 @@ def register_catalog_access(app: Any) -> None:
 
     @app.after_request  # type: ignore[misc]
     def _catalog_after_request(response: Response):
-        state = getattr(g, "catalog_state", None)
-        payload = getattr(g, "catalog_payload", None)
+        state = g.get("catalog_state")
+        payload = g.get("catalog_payload")
         if not isinstance(state, UserCatalogState) or state.is_admin or not payload:
             return response
         if not _should_inject(response):
@@ -733,7 +739,7 @@ def register_catalog_access(app: Any) -> None:
 
         # Ensure scoped pages show the correct title immediately (avoid flicker).
         try:
-            _inject_scope_header(response, payload, getattr(g, "catalog_scope", CatalogScope.ALL))
+            _inject_scope_header(response, payload, g.get("catalog_scope", CatalogScope.ALL))
         except Exception:
             LOG.debug("Scope header injection failed", exc_info=True)
 
@@ -33,6 +33,7 @@ LOG = get_logger("mozello_sync_injection")
 MARKER = "ub-sync-to-mozello"
 ANCHOR = 'id="edit_book"'
 MAX_BODY_SIZE = 1_500_000  # bytes
+_BOOK_PATH_RE = re.compile(r"^/book/\d+$")
 
 
 def _js_string(value: str) -> str:
@@ -45,7 +46,7 @@ def _js_string(value: str) -> str:
 
 def _is_target_request(req: Request) -> bool:
     path = (req.path or "").rstrip("/")
-    return bool(re.match(r"^/book/\d+$", path))
+    return bool(_BOOK_PATH_RE.match(path))
 
 
 def _should_skip(response: Response) -> Tuple[bool, str]:
@@ -16,13 +16,15 @@ Behavior:
 
 from __future__ import annotations
 
+import base64
+import hashlib
 import json
+import os
 import re
-from string import Template
 from typing import Any, List, Tuple
 from urllib.parse import urlparse
 
-from flask import Request, Response, request
+from flask import Request, Response, request, url_for
 
 from app.services import books_sync
 from app.utils.logging import get_logger
@@ -31,11 +33,16 @@ LOG = get_logger("mz_pictures_gallery_injection")
 
 MARKER = "ub-mz-pictures-gallery"
 MAX_BODY_SIZE = 1_500_000  # bytes
+_BOOK_PATH_RE = re.compile(r"^/book/(\d+)$")
+SCRIPT_FILENAME = "js/mz_pictures_gallery.js"
+SCRIPT_PATH = os.path.join(
+		os.path.dirname(__file__), os.pardir, os.pardir, "static", *SCRIPT_FILENAME.split("/")
+)
 
 
 def _is_target_request(req: Request) -> Tuple[bool, int | None]:
 		path = (req.path or "").rstrip("/")
-		match = re.match(r"^/book/(\d+)$", path)
+		match = _BOOK_PATH_RE.match(path)
 		if not match:
 				return False, None
 		try:
@@ -69,147 +76,37 @@ def _js(value: Any) -> str:
 		return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
 
 
-def _build_snippet(book_id: int, extra_urls: List[str]) -> bytes:
-		script = Template(
-				"""
-<script type="application/json" data-ub-mz-gallery-data="1" data-$marker="1">$data</script>
-<script data-$marker="1">
-(function() {
-	'use strict';
-
-	function getUrls(root) {
-		root = root || document;
-		var dataEl = root.querySelector('[data-ub-mz-gallery-data="1"]');
-		if (!dataEl) { return []; }
-		try {
-			var parsed = JSON.parse((dataEl.textContent || '').trim() || '{}');
-			var urls = parsed && parsed.urls;
-			return Array.isArray(urls) ? urls.filter(Boolean) : [];
-		} catch (e) {
-			return [];
-		}
-	}
-
-	function removeGallery(root) {
-		root = root || document;
-		var existing = root.querySelector('[data-ub-mz-gallery="1"]');
-		if (existing && existing.parentElement) {
-			existing.parentElement.removeChild(existing);
-		}
-	}
-
-	function ensureGallery(root) {
-		root = root || document;
-		var urls = getUrls(root);
-		if (!urls.length) {
-			removeGallery(root);
-			return;
-		}
-
-		var cover = root.querySelector('#detailcover');
-		if (!cover) {
-			return;
-		}
-		if (root.querySelector('[data-ub-mz-gallery="1"]')) {
-			return;
-		}
-
-		var coverContainer = cover.closest('.cover') || cover.parentElement;
-		if (!coverContainer || !coverContainer.parentElement) { return; }
-
-		// Store the original src once, so we can restore after fullscreen exit.
-		if (!cover.dataset.ubOrigSrc) {
-			cover.dataset.ubOrigSrc = cover.getAttribute('src') || cover.src || '';
-		}
-
-		function isFullscreen() {
-			return !!(document.fullscreenElement || document.webkitFullscreenElement || document.mozFullScreenElement || document.msFullscreenElement);
-		}
-
-		function restoreCoverIfNeeded() {
-			if (isFullscreen()) { return; }
-			if (cover.dataset.ubTempSrc && cover.dataset.ubOrigSrc) {
-				cover.setAttribute('src', cover.dataset.ubOrigSrc);
-				delete cover.dataset.ubTempSrc;
-			}
-		}
-
-		if (!window.__ubMzGalleryFullscreenHook) {
-			window.__ubMzGalleryFullscreenHook = true;
-			document.addEventListener('fullscreenchange', restoreCoverIfNeeded);
-			document.addEventListener('webkitfullscreenchange', restoreCoverIfNeeded);
-			document.addEventListener('mozfullscreenchange', restoreCoverIfNeeded);
-			document.addEventListener('MSFullscreenChange', restoreCoverIfNeeded);
-		}
-
-		var gallery = document.createElement('div');
-		gallery.setAttribute('data-ub-mz-gallery', '1');
-		gallery.className = 'ub-mz-gallery';
-
-		urls.forEach(function(url) {
-			if (!url) { return; }
-
-			// Tile wrapper makes height:100% meaningful and keeps a consistent grid.
-			var tile = document.createElement('div');
-			tile.className = 'ub-mz-gallery__tile';
-
-			var img = document.createElement('img');
-			img.alt = '';
-			img.src = url;
-			img.className = 'ub-mz-gallery__img';
-			img.addEventListener('click', function() {
-				if (!cover.dataset.ubOrigSrc) {
-					cover.dataset.ubOrigSrc = cover.getAttribute('src') || cover.src || '';
-				}
-				cover.dataset.ubTempSrc = url;
-				cover.setAttribute('src', url);
-
-				if (isFullscreen()) {
-					return;
-				}
-				// Fullscreen API requires a real user gesture. Calling the upstream helper
-				// directly from THIS click handler preserves that gesture.
-				if (typeof window.toggleFullscreen === 'function') {
-					window.toggleFullscreen(cover);
-					return;
-				}
-				// Fallback: directly request fullscreen.
-				var req = cover.requestFullscreen || cover.webkitRequestFullscreen || cover.mozRequestFullScreen || cover.msRequestFullscreen;
-				if (req) { req.call(cover); }
-			});
-
-			tile.appendChild(img);
-			gallery.appendChild(tile);
-		});
-
-		coverContainer.parentElement.insertBefore(gallery, coverContainer.nextSibling);
-	}
-
-	function init() {
-		ensureGallery(document);
-	}
-
-	if (document.readyState === 'loading') {
-		document.addEventListener('DOMContentLoaded', init);
-	} else {
-		init();
-	}
-
-	// When rendered into the modal via AJAX, ensure we bind after it is shown.
-	if (window.jQuery && typeof window.jQuery === 'function' && window.jQuery.fn && window.jQuery.fn.modal) {
-		window.jQuery('#bookDetailsModal').on('shown.bs.modal', function() {
-			ensureGallery(this);
-		});
-	}
-})();
-</script>
-"""
-		)
+def _script_fingerprint() -> Tuple[str, str]:
+		"""Return (cache-busting version, SRI integrity) for the gallery script."""
+		try:
+				with open(SCRIPT_PATH, "rb") as fh:
+						source = fh.read()
+		except OSError as exc:  # pragma: no cover - packaging error
+				LOG.warning("mz_pictures gallery script missing path=%s: %s", SCRIPT_PATH, exc)
+				return "0", ""
+		version = hashlib.sha256(source).hexdigest()[:12]
+		integrity = "sha384-" + base64.b64encode(hashlib.sha384(source).digest()).decode("ascii")
+		return version, integrity
+
+
+# The script is a static asset served from /app_static; its hash is computed
+# once at import so the URL changes (and caches bust) only when it is edited.
+_SCRIPT_VERSION, _SCRIPT_INTEGRITY = _script_fingerprint()
 
-		data = _js({"book_id": book_id, "urls": extra_urls})
-		rendered = script.substitute(marker=MARKER, data=data)
-		return rendered.encode("utf-8")
 
+def _script_tag() -> str:
+		try:
+				src = url_for("_app_templates.static", filename=SCRIPT_FILENAME, v=_SCRIPT_VERSION)
+		except Exception:
+				src = f"/app_static/{SCRIPT_FILENAME}?v={_SCRIPT_VERSION}"
+		integrity = f' integrity="{_SCRIPT_INTEGRITY}"' if _SCRIPT_INTEGRITY else ""
+		return f'<script src="{src}"{integrity} data-{MARKER}="1" defer></script>\n'
+
+
+def _build_snippet(book_id: int, extra_urls: List[str]) -> bytes:
+		data = _js({"book_id": book_id, "urls": extra_urls})
+		data_tag = f'\n<script type="application/json" data-ub-mz-gallery-data="1" data-{MARKER}="1">{data}</script>\n'
+		return (data_tag + _script_tag()).encode("utf-8")
 
 
 def _inject(response: Response, book_id: int, extra_urls: List[str]) -> Response:
@@ -300,8 +197,8 @@ def register_mz_pictures_gallery_injection(app: Any) -> None:  # pragma: no cove
 						return resp
 
 				try:
-						pictures = books_sync.get_mz_pictures_for_book(book_id)
-						cover_uids = set(books_sync.get_mz_cover_picture_uids_for_book(book_id))
+						pictures, cover_list = books_sync.get_mz_gallery_identifiers(book_id)
+						cover_uids = set(cover_list)
 						extra_urls = [
 								p["url"]
 								for p in pictures
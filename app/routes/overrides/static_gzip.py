@@ -0,0 +1,107 @@
+"""Serve app static text assets gzip-compressed from an in-process cache.
+
+Assets under /app_static (theme CSS, catalog JS, icons) are requested on every
+page view. Instead of letting the reverse proxy recompress them per request,
+each file is compressed once (keyed by its ETag, which changes with mtime and
+size) and the cached bytes are reused for every client that accepts gzip.
+Responses that already carry a Content-Encoding, partial responses and 304s
+pass through untouched. Requests for a content-versioned URL (``?v=<hash>``)
+are marked immutable so browsers skip revalidation entirely.
+"""
+
+from __future__ import annotations
+
+import gzip
+import threading
+from typing import Any, Dict, Tuple
+
+from flask import Response, request
+
+from app.utils.logging import get_logger
+
+LOG = get_logger("static_gzip")
+
+STATIC_ENDPOINT = "_app_templates.static"
+COMPRESSIBLE_MIMETYPES = frozenset({
+    "text/css",
+    "text/javascript",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+})
+MIN_SIZE = 512  # bytes; below this gzip framing outweighs the savings
+MAX_CACHE_ENTRIES = 256
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+_GZIP_CACHE: Dict[Tuple[str, str], bytes] = {}
+_GZIP_CACHE_LOCK = threading.Lock()
+
+
+def _should_skip(response: Response) -> Tuple[bool, str]:
+    if request.endpoint != STATIC_ENDPOINT:
+        return True, "not_static"
+    if response.status_code != 200:
+        return True, f"status_{response.status_code}"
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return True, f"mimetype_{response.mimetype or 'none'}"
+    if response.content_encoding:
+        return True, "already_encoded"
+    if "gzip" not in request.accept_encodings:
+        return True, "gzip_not_accepted"
+    etag, _weak = response.get_etag()
+    if not etag:
+        return True, "etag_missing"
+    return False, "ok"
+
+
+def _compressed_body(response: Response) -> bytes | None:
+    key = (request.path, response.get_etag()[0] or "")
+    with _GZIP_CACHE_LOCK:
+        cached = _GZIP_CACHE.get(key)
+    if cached is not None:
+        return cached
+    response.direct_passthrough = False
+    body = response.get_data()
+    if len(body) < MIN_SIZE:
+        return None
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    with _GZIP_CACHE_LOCK:
+        if len(_GZIP_CACHE) >= MAX_CACHE_ENTRIES:
+            _GZIP_CACHE.clear()
+        _GZIP_CACHE[key] = compressed
+    return compressed
+
+
+def register_static_gzip(app: Any) -> None:
+    if getattr(app, "_ebookslv_static_gzip", False):  # type: ignore[attr-defined]
+        return
+
+    @app.after_request  # type: ignore[misc]
+    def _after(resp: Response):  # type: ignore[override]
+        if request.endpoint == STATIC_ENDPOINT:
+            resp.vary.add("Accept-Encoding")
+            if request.args.get("v") and resp.status_code in (200, 304):
+                resp.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        skip, _reason = _should_skip(resp)
+        if skip:
+            return resp
+        try:
+            compressed = _compressed_body(resp)
+        except Exception as exc:  # pragma: no cover - defensive
+            LOG.debug("static gzip failed path=%s: %s", request.path, exc)
+            return resp
+        if compressed is None:
+            return resp
+        close = getattr(resp.response, "close", None)
+        if callable(close):
+            close()  # cache hit: release the unread file wrapper
+        resp.direct_passthrough = False
+        resp.set_data(compressed)
+        resp.content_encoding = "gzip"
+        return resp
+
+    setattr(app, "_ebookslv_static_gzip", True)
+    LOG.debug("static gzip registered")
+
+
+__all__ = ["register_static_gzip"]
@@ -1,56 +1,49 @@
 """Service exports."""
 
-from .orders_service import (
-    create_order,
-    create_user_for_order,
-    delete_order,
-    import_paid_orders,
-    process_webhook_order,
-    list_orders,
-    refresh_order,
-    OrderValidationError,
-    OrderAlreadyExistsError,
-    OrderNotFoundError,
-    OrderImportError,
-    CalibreUnavailableError,
-    UserAlreadyExistsError,
-)
-from .email_templates_service import (
-    fetch_templates_context,
-    save_template as save_email_template,
-    TemplateValidationError,
-)
-from .email_delivery import (
-    send_book_purchase_email,
-    BookDeliveryItem,
-)
-from .shelves_service import (
-    ensure_wishlist_shelf_for_user,
-)
-from . import books_sync, auth_link_service, password_reset_service, operator_manual_service
+import importlib
 
-__all__ = [
-    "list_orders",
-    "create_order",
-    "create_user_for_order",
-    "refresh_order",
-    "delete_order",
-    "import_paid_orders",
-    "process_webhook_order",
-    "OrderValidationError",
-    "OrderAlreadyExistsError",
-    "OrderNotFoundError",
-    "OrderImportError",
-    "CalibreUnavailableError",
-    "UserAlreadyExistsError",
-    "books_sync",
-    "auth_link_service",
-    "password_reset_service",
-    "fetch_templates_context",
-    "save_email_template",
-    "TemplateValidationError",
-    "send_book_purchase_email",
-    "BookDeliveryItem",
-    "ensure_wishlist_shelf_for_user",
-    "operator_manual_service",
-]
+# Public name -> (submodule, attribute); attribute None re-exports the submodule.
+# Resolved lazily on first access (PEP 562), so importing one service does not
+# pull in every other service module.
+_EXPORTS = {
+    "list_orders": ("orders_service", "list_orders"),
+    "create_order": ("orders_service", "create_order"),
+    "create_user_for_order": ("orders_service", "create_user_for_order"),
+    "refresh_order": ("orders_service", "refresh_order"),
+    "delete_order": ("orders_service", "delete_order"),
+    "import_paid_orders": ("orders_service", "import_paid_orders"),
+    "process_webhook_order": ("orders_service", "process_webhook_order"),
+    "OrderValidationError": ("orders_service", "OrderValidationError"),
+    "OrderAlreadyExistsError": ("orders_service", "OrderAlreadyExistsError"),
+    "OrderNotFoundError": ("orders_service", "OrderNotFoundError"),
+    "OrderImportError": ("orders_service", "OrderImportError"),
+    "CalibreUnavailableError": ("orders_service", "CalibreUnavailableError"),
+    "UserAlreadyExistsError": ("orders_service", "UserAlreadyExistsError"),
+    "fetch_templates_context": ("email_templates_service", "fetch_templates_context"),
+    "save_email_template": ("email_templates_service", "save_template"),
+    "TemplateValidationError": ("email_templates_service", "TemplateValidationError"),
+    "send_book_purchase_email": ("email_delivery", "send_book_purchase_email"),
+    "BookDeliveryItem": ("email_delivery", "BookDeliveryItem"),
+    "ensure_wishlist_shelf_for_user": ("shelves_service", "ensure_wishlist_shelf_for_user"),
+    "books_sync": ("books_sync", None),
+    "auth_link_service": ("auth_link_service", None),
+    "password_reset_service": ("password_reset_service", None),
+    "operator_manual_service": ("operator_manual_service", None),
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    try:
+        module_name, attr = _EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(f".{module_name}", __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -8,32 +8,35 @@ Used to render archived purchased books on the My Books page.
 
 from __future__ import annotations
 
-from typing import Any, Iterable, List, Optional, Set
+from typing import Any, Collection, Iterable, List, Optional, Set
 
 from app.utils.logging import get_logger
 
 LOG = get_logger("archived_books_service")
 
 
-def list_archived_book_ids_for_user(calibre_user_id: Optional[int]) -> Set[int]:
+def list_archived_book_ids_for_user(
+    calibre_user_id: Optional[int],
+    book_ids: Optional[Collection[int]] = None,
+) -> Set[int]:
+    """Return the user's archived book ids, optionally limited to ``book_ids``."""
     if calibre_user_id is None:
         return set()
+    if book_ids is not None and not book_ids:
+        return set()
     try:
         from cps import ub  # type: ignore
 
+        # Only book_id is needed: select the column and unpack plain tuples
+        # instead of hydrating ArchivedBook instances.
         archived_rows = (
-            ub.session.query(ub.ArchivedBook)
+            ub.session.query(ub.ArchivedBook.book_id)
             .filter(ub.ArchivedBook.user_id == int(calibre_user_id))
             .filter(ub.ArchivedBook.is_archived == True)
-            .all()
         )
-        out: Set[int] = set()
-        for row in archived_rows:
-            try:
-                out.add(int(getattr(row, "book_id", None)))
-            except (TypeError, ValueError):
-                continue
-        return out
+        if book_ids is not None:
+            archived_rows = archived_rows.filter(ub.ArchivedBook.book_id.in_(book_ids))
+        return {book_id for (book_id,) in archived_rows if book_id is not None}
     except Exception:
         LOG.debug("Failed to list archived book ids", exc_info=True)
         return set()
@@ -62,8 +65,9 @@ def list_archived_purchased_entries(
     if not purchased:
         return []
 
-    archived_ids = list_archived_book_ids_for_user(calibre_user_id)
-    target_ids = sorted(purchased.intersection(archived_ids))
+    # Intersect in SQL: archived non-purchased (e.g. free) books are never loaded,
+    # and the common "nothing archived" case is a single index probe.
+    target_ids = list_archived_book_ids_for_user(calibre_user_id, purchased)
     if not target_ids:
         return []
 
@@ -79,6 +79,9 @@ def _sanitize_book_ids(book_ids: Optional[Any]) -> List[int]:
         return []
     if not isinstance(book_ids, list):
         raise TokenDecodeError("book_ids_invalid")
+    # Fast path: ids already decoded as plain ints (bools excluded) need no coercion.
+    if set(map(type, book_ids)) <= {int}:
+        return list(book_ids)
     try:
         return [int(value) for value in book_ids]
     except (TypeError, ValueError) as exc:
@@ -4,17 +4,18 @@ Read Calibre metadata.db for book list, mz_price custom column and mz_handle
 identifier. Provides minimal read helpers plus identifier insert/delete.
 """
 from __future__ import annotations
-from typing import Dict, Iterable, List, Optional, Tuple, Set
+from typing import Collection, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Set
 import os, sqlite3, base64, json
+from app import config as app_config
 from app.utils.logging import get_logger
 
 LOG = get_logger("books_sync")
 
-DEFAULT_LIBRARY_ROOT = "/app/library"
+DEFAULT_LIBRARY_ROOT = app_config.DEFAULT_CALIBRE_LIBRARY_PATH
 
 
 def _library_root() -> str:
-    return os.getenv("CALIBRE_LIBRARY_PATH", DEFAULT_LIBRARY_ROOT)
+    return app_config.calibre_library_path()
 
 
 def _db_path() -> str:
@@ -28,29 +29,54 @@ def _connect_rw() -> sqlite3.Connection:
     return conn
 
 
-def _identifier_map(conn: sqlite3.Connection, type_name: str) -> Dict[int, str]:
+def _in_clause(column: str, count: int) -> str:
+    return f" AND {column} IN (" + ",".join(["?"] * count) + ")"
+
+
+def _identifier_map(
+    conn: sqlite3.Connection,
+    type_name: str,
+    book_ids: Optional[Collection[int]] = None,
+) -> Dict[int, str]:
+    """Return book_id -> identifier value, optionally limited to ``book_ids``."""
     mapping: Dict[int, str] = {}
+    sql = "SELECT book, val FROM identifiers WHERE type=?"
+    params: Tuple = (type_name,)
+    if book_ids is not None:
+        if not book_ids:
+            return mapping
+        sql += _in_clause("book", len(book_ids))
+        params += tuple(book_ids)
     try:
-        for row in conn.execute("SELECT book, val FROM identifiers WHERE type=?", (type_name,)):
-            value = row[1]
-            if isinstance(value, str) and value.strip():
-                mapping[int(row[0])] = value.strip()
+        for book_id, value in conn.execute(sql, params):
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    mapping[book_id] = value
     except Exception:  # pragma: no cover
         pass
     return mapping
 
 
-def _language_map(conn: sqlite3.Connection) -> Dict[int, str]:
+def _language_map(conn: sqlite3.Connection, book_ids: Optional[Collection[int]] = None) -> Dict[int, str]:
     """Return mapping of book_id -> normalized language code (first language only)."""
     mapping: Dict[int, str] = {}
+    params: Tuple = ()
+    where = ""
+    if book_ids is not None:
+        if not book_ids:
+            return mapping
+        where = " WHERE 1=1" + _in_clause("bll.book", len(book_ids))
+        params = tuple(book_ids)
     try:
         query = (
             "SELECT bll.book, l.lang_code "
             "FROM books_languages_link bll "
-            "JOIN languages l ON l.id = bll.lang_code "
-            "ORDER BY bll.book ASC, bll.item_order ASC"
+            "JOIN languages l ON l.id = bll.lang_code"
+            + where
+            + " ORDER BY bll.book ASC, bll.item_order ASC"
         )
-        for row in conn.execute(query):
+        for row in conn.execute(query, params):
             book_id = int(row[0])
             if book_id in mapping:
                 continue
@@ -101,29 +127,27 @@ def _get_identifier(conn: sqlite3.Connection, book_id: int, type_name: str) -> O
 
 
 def _set_identifier(book_id: int, type_name: str, value: Optional[str]) -> bool:
+    cleaned = (value or "").strip()
     try:
         conn = _connect_rw()
-        cleaned = (value or "").strip()
-        cur = conn.execute(
-            "SELECT val FROM identifiers WHERE book=? AND type=? LIMIT 1",
-            (book_id, type_name),
-        )
-        row = cur.fetchone()
-        if not cleaned:
-            if row:
-                conn.execute("DELETE FROM identifiers WHERE book=? AND type=?", (book_id, type_name))
+        try:
+            if not cleaned:
+                cur = conn.execute("DELETE FROM identifiers WHERE book=? AND type=?", (book_id, type_name))
+            else:
+                # Single upsert on Calibre's UNIQUE(book, type); the WHERE keeps
+                # unchanged values from being rewritten.
+                cur = conn.execute(
+                    "INSERT INTO identifiers (book, type, val) VALUES (?, ?, ?) "
+                    "ON CONFLICT(book, type) DO UPDATE SET val=excluded.val "
+                    "WHERE val IS NOT excluded.val COLLATE BINARY",
+                    (book_id, type_name, cleaned),
+                )
+            if cur.rowcount:
                 conn.commit()
-            return True
-        if row:
-            if row[0] == cleaned:
-                return True
-            conn.execute("UPDATE identifiers SET val=? WHERE book=? AND type=?", (cleaned, book_id, type_name))
-        else:
-            conn.execute(
-                "INSERT INTO identifiers (book, type, val) VALUES (?, ?, ?)",
-                (book_id, type_name, cleaned),
-            )
-        conn.commit()
+            else:
+                conn.rollback()
+        finally:
+            conn.close()
         return True
     except Exception as exc:  # pragma: no cover
         LOG.warning("_set_identifier failed type=%s book_id=%s: %s", type_name, book_id, exc)
@@ -157,7 +181,10 @@ def _write_mz_price(conn: sqlite3.Connection, book_id: int, price: Optional[floa
         if cleaned_price is None:
             if row:
                 conn.execute(f"DELETE FROM {table} WHERE book=?", (book_id,))
-            conn.commit()
+                conn.commit()
+            return True
+        if row and row[0] == cleaned_price:
+            # Unchanged: skip the write transaction entirely.
             return True
         if row:
             conn.execute(f"UPDATE {table} SET value=? WHERE book=?", (cleaned_price, book_id))
@@ -170,71 +197,83 @@ def _write_mz_price(conn: sqlite3.Connection, book_id: int, price: Optional[floa
         return False
 
 
-def list_calibre_books(limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+def iter_calibre_books(limit: Optional[int] = None) -> Iterator[Dict[str, Optional[str]]]:
+    """Yield one row per Calibre book (same shape as :func:`list_calibre_books`).
+
+    The connection and the price/identifier/language lookups are set up before
+    this returns, so errors raise to the caller instead of on the first
+    iteration (for a streamed response, after the status line was sent). The
+    books table is then streamed from the cursor, and the connection is closed
+    when the iterator finishes or is closed early.
+    """
+    rows = _calibre_book_rows(limit)
+    next(rows)  # run the setup up to the first yield
+    return rows
+
+
+def _calibre_book_rows(limit: Optional[int]) -> Iterator[Optional[Dict[str, Optional[str]]]]:
     conn = _connect_rw()
-    price_id = _mz_price_column_id(conn)
-    price_tbl = f"custom_column_{price_id}" if price_id is not None else None
-    sql = "SELECT b.id, b.title FROM books b ORDER BY b.id ASC"
-    if limit:
-        sql += f" LIMIT {int(limit)}"
-    rows = conn.execute(sql).fetchall()
-    prices: Dict[int, float] = {}
-    if price_tbl:
-        try:
-            for r in conn.execute(f"SELECT book, value FROM {price_tbl}"):
-                if r[1] is not None:
-                    prices[int(r[0])] = float(r[1])
-        except Exception:  # pragma: no cover
-            pass
-    handles = _identifier_map(conn, "mz")
-    relative_urls = _identifier_map(conn, "mz_relative_url")
-    languages = _language_map(conn)
-    out: List[Dict[str, Optional[str]]] = []
-    for r in rows:
-        bid = int(r[0])
-        out.append({
-            "book_id": bid,
-            "title": r[1],
-            "mz_price": prices.get(bid),
-            "mz_handle": handles.get(bid),
-            "mz_relative_url": relative_urls.get(bid),
-            "language_code": languages.get(bid),
-        })
-    return out
+    try:
+        price_id = _mz_price_column_id(conn)
+        price_tbl = f"custom_column_{price_id}" if price_id is not None else None
+        sql = "SELECT b.id, b.title FROM books b ORDER BY b.id ASC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        prices: Dict[int, float] = {}
+        if price_tbl:
+            try:
+                for book_id, value in conn.execute(f"SELECT book, value FROM {price_tbl}"):
+                    if value is not None:
+                        prices[book_id] = float(value)
+            except Exception:  # pragma: no cover
+                pass
+        handles = _identifier_map(conn, "mz")
+        relative_urls = _identifier_map(conn, "mz_relative_url")
+        languages = _language_map(conn)
+        cursor = conn.execute(sql)
+        yield None  # setup done; consumed by iter_calibre_books
+        # One row per library book: bind the lookups locally instead of resolving
+        # four dict attributes per iteration (book ids are INTEGER, no coercion).
+        price_of, handle_of, url_of, language_of = prices.get, handles.get, relative_urls.get, languages.get
+        for bid, title in cursor:
+            yield {
+                "book_id": bid,
+                "title": title,
+                "mz_price": price_of(bid),
+                "mz_handle": handle_of(bid),
+                "mz_relative_url": url_of(bid),
+                "language_code": language_of(bid),
+            }
+    finally:
+        conn.close()
 
 
-def list_free_book_ids() -> Set[int]:
+def list_calibre_books(limit: Optional[int] = None) -> List[Dict[str, Optional[str]]]:
+    return list(iter_calibre_books(limit))
+
+
+def list_free_book_ids() -> FrozenSet[int]:
     """Return Calibre book ids where mz_price is missing or zero.
 
     Missing mz_price column yields empty set so callers can fall back gracefully.
+    The result is immutable so callers may share it without copying.
     """
-    free_ids: Set[int] = set()
     conn = _connect_rw()
     try:
         price_id = _mz_price_column_id(conn)
         if price_id is None:
-            return free_ids
+            return frozenset()
         price_tbl = f"custom_column_{price_id}"
-        prices: Dict[int, Optional[float]] = {}
-        for row in conn.execute(f"SELECT book, value FROM {price_tbl}"):
-            try:
-                prices[int(row[0])] = None if row[1] is None else float(row[1])
-            except Exception:
-                continue
-        all_ids = [int(r[0]) for r in conn.execute("SELECT id FROM books")]
-        for bid in all_ids:
-            val = prices.get(bid)
-            if val is None:
-                free_ids.add(bid)
-                continue
-            try:
-                if float(val) == 0:
-                    free_ids.add(bid)
-            except Exception:
-                continue
+        sql = (
+            "SELECT b.id FROM books b "
+            f"LEFT JOIN {price_tbl} p ON p.book = b.id "
+            "WHERE p.value IS NULL OR p.value = 0"
+        )
+        return frozenset(bid for (bid,) in conn.execute(sql))
     except Exception:  # pragma: no cover - defensive
-        return free_ids
-    return free_ids
+        return frozenset()
+    finally:
+        conn.close()
 
 
 def _book_path(conn: sqlite3.Connection, book_id: int) -> Optional[str]:
@@ -306,10 +345,17 @@ def set_mz_price(book_id: int, price: Optional[float]) -> bool:
     """
     try:
         conn = _connect_rw()
-        return _write_mz_price(conn, book_id, price)
+        stored = _write_mz_price(conn, book_id, price)
     except Exception as exc:  # pragma: no cover
         LOG.warning("set_mz_price failed book_id=%s: %s", book_id, exc)
         return False
+    if stored:
+        # Prices decide which books are free; drop this request's free-id set.
+        # Local import: catalog_access imports this module.
+        from app.services import catalog_access
+
+        catalog_access.invalidate_catalog_state_cache()
+    return stored
 
 
 def set_mz_price_for_handle(handle: str, price: Optional[float]) -> bool:
@@ -397,7 +443,10 @@ def get_mz_cover_picture_uids_for_book(book_id: int) -> List[str]:
     Stored in Calibre identifiers as type 'mz_cover_uids' (JSON list).
     """
     conn = _connect_rw()
-    raw = _get_identifier(conn, book_id, "mz_cover_uids")
+    return _parse_cover_uids(_get_identifier(conn, book_id, "mz_cover_uids"))
+
+
+def _parse_cover_uids(raw: Optional[str]) -> List[str]:
     if not raw:
         return []
     try:
@@ -469,7 +518,10 @@ def get_mz_pictures_for_book(book_id: int) -> List[Dict[str, str]]:
     Stored in Calibre identifiers as type 'mz_pictures' (JSON list).
     """
     conn = _connect_rw()
-    raw = _get_identifier(conn, book_id, "mz_pictures")
+    return _parse_mz_pictures(_get_identifier(conn, book_id, "mz_pictures"))
+
+
+def _parse_mz_pictures(raw: Optional[str]) -> List[Dict[str, str]]:
     if not raw:
         return []
     try:
@@ -489,6 +541,24 @@ def get_mz_pictures_for_book(book_id: int) -> List[Dict[str, str]]:
     return out
 
 
+def get_mz_gallery_identifiers(book_id: int) -> Tuple[List[Dict[str, str]], List[str]]:
+    """Return ``(pictures, cover_uids)`` for a book using one connection and query.
+
+    Per-request variant of get_mz_pictures_for_book +
+    get_mz_cover_picture_uids_for_book for the book detail gallery.
+    """
+    conn = _connect_rw()
+    try:
+        rows = conn.execute(
+            "SELECT type, val FROM identifiers WHERE book=? AND type IN ('mz_pictures', 'mz_cover_uids')",
+            (book_id,),
+        ).fetchall()
+    finally:
+        conn.close()
+    raw = {row[0]: row[1].strip() for row in rows if isinstance(row[1], str) and row[1].strip()}
+    return _parse_mz_pictures(raw.get("mz_pictures")), _parse_cover_uids(raw.get("mz_cover_uids"))
+
+
 def set_mz_pictures(book_id: int, pictures: Optional[List[Dict[str, Any]]]) -> bool:
     """Persist Mozello pictures list (uid+url) for later display.
 
@@ -537,6 +607,7 @@ def set_mz_pictures_for_handle(handle: str, pictures: Optional[List[Dict[str, An
 
 __all__ = [
     "list_calibre_books",
+    "iter_calibre_books",
     "set_mz_handle",
     "clear_mz_handle",
     "set_mz_price",
@@ -557,6 +628,7 @@ __all__ = [
     "set_mz_cover_picture_uids_for_handle",
     "clear_mz_cover_picture_uids_for_handle",
     "get_mz_pictures_for_book",
+    "get_mz_gallery_identifiers",
     "set_mz_pictures",
     "get_mz_pictures_for_handle",
     "set_mz_pictures_for_handle",
@@ -569,16 +641,20 @@ def lookup_books_by_handles(handles: Iterable[str]) -> Dict[str, Dict[str, Optio
     if not normalized:
         return {}
     conn = _connect_rw()
-    placeholders = ",".join(["?"] * len(normalized))
-    sql = (
-        "SELECT lower(i.val) AS handle, b.id, b.title "
-        "FROM identifiers i "
-        "JOIN books b ON b.id = i.book "
-        "WHERE i.type='mz' AND lower(i.val) IN (" + placeholders + ")"
-    )
-    rows = conn.execute(sql, tuple(normalized)).fetchall()
-    relative_map = _identifier_map(conn, "mz_relative_url")
-    lang_map = _language_map(conn)
+    try:
+        sql = (
+            "SELECT lower(i.val) AS handle, b.id, b.title "
+            "FROM identifiers i "
+            "JOIN books b ON b.id = i.book "
+            "WHERE i.type='mz'" + _in_clause("lower(i.val)", len(normalized))
+        )
+        rows = conn.execute(sql, tuple(normalized)).fetchall()
+        # Resolve URLs and languages only for the matched books, not the library.
+        matched_ids = {int(row[1]) for row in rows}
+        relative_map = _identifier_map(conn, "mz_relative_url", matched_ids)
+        lang_map = _language_map(conn, matched_ids)
+    finally:
+        conn.close()
     result: Dict[str, Dict[str, Optional[str]]] = {}
     for handle, book_id, title in rows:
         key = (handle or "").strip().lower()
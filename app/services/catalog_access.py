@@ -3,13 +3,23 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, FrozenSet, Optional, Set
+
+from flask import g, has_app_context
 
 from app.db.repositories import users_books_repo
 from app.services import books_sync
 from app.utils.identity import normalize_email
 
 
+# Resolved states and the free-id set are reused within one request only, via
+# a dict on flask.g. A process-wide cache would go stale across gunicorn
+# workers: invalidation only reaches the worker that wrote the order, and
+# prices are edited in Calibre-Web without notifying any worker. Free ids are
+# identical for every visitor, so all states of a request share one frozenset.
+_REQUEST_CACHE_ATTR = "_catalog_access_cache"
+
+
 class BookState(str, Enum):
     """Supported catalog states for rendered books."""
 
@@ -18,37 +28,46 @@ class BookState(str, Enum):
     FREE = "free"
 
 
+def _coerce_book_id(book_id: Any) -> Optional[int]:
+    # Called per rendered book; Calibre ids are almost always plain ints already.
+    if type(book_id) is int:
+        return book_id
+    if book_id is None:
+        return None
+    try:
+        return int(book_id)
+    except (TypeError, ValueError):
+        return None
+
+
 @dataclass(frozen=True)
 class UserCatalogState:
-    """Book access metadata resolved for the active request."""
+    """Book access metadata resolved for the active request.
+
+    Id collections are frozensets so a state can be shared safely between
+    hooks (and requests) without defensive copies.
+    """
 
     is_admin: bool
     is_authenticated: bool = False
-    purchased_book_ids: Set[int] = field(default_factory=set)
-    free_book_ids: Set[int] = field(default_factory=set)
+    purchased_book_ids: FrozenSet[int] = field(default_factory=frozenset)
+    free_book_ids: FrozenSet[int] = field(default_factory=frozenset)
 
     def is_purchased(self, book_id: Optional[int]) -> bool:
-        if book_id is None:
-            return False
-        try:
-            candidate = int(book_id)
-        except (TypeError, ValueError):
-            return False
-        return candidate in self.purchased_book_ids
+        candidate = _coerce_book_id(book_id)
+        return candidate is not None and candidate in self.purchased_book_ids
 
     def is_free(self, book_id: Optional[int]) -> bool:
-        if book_id is None:
-            return False
-        try:
-            candidate = int(book_id)
-        except (TypeError, ValueError):
-            return False
-        return candidate in self.free_book_ids
+        candidate = _coerce_book_id(book_id)
+        return candidate is not None and candidate in self.free_book_ids
 
     def book_state(self, book_id: Optional[int]) -> BookState:
-        if self.is_purchased(book_id):
+        candidate = _coerce_book_id(book_id)
+        if candidate is None:
+            return BookState.AVAILABLE
+        if candidate in self.purchased_book_ids:
             return BookState.PURCHASED
-        if self.is_free(book_id):
+        if candidate in self.free_book_ids:
             return BookState.FREE
         return BookState.AVAILABLE
 
@@ -67,27 +86,72 @@ def build_catalog_state(
     email: Optional[str],
     is_admin: bool,
 ) -> UserCatalogState:
-    free_ids = books_sync.list_free_book_ids()
+    normalized_email = normalize_email(email)
+    key = ("state", calibre_user_id, normalized_email, bool(is_admin))
+    cache = _request_cache()
+    state = cache.get(key) if cache is not None else None
+    if state is None:
+        state = _load_catalog_state(
+            calibre_user_id=calibre_user_id,
+            email=normalized_email,
+            is_admin=is_admin,
+        )
+        if cache is not None:
+            cache[key] = state
+    return state
+
+
+def invalidate_catalog_state_cache() -> None:
+    """Forget catalog data reused within this request (call after purchases or prices change)."""
+    cache = _request_cache()
+    if cache is not None:
+        cache.clear()
+
+
+def _request_cache() -> Optional[Dict[Any, Any]]:
+    if not has_app_context():
+        return None
+    cache = g.get(_REQUEST_CACHE_ATTR)
+    if cache is None:
+        cache = {}
+        setattr(g, _REQUEST_CACHE_ATTR, cache)
+    return cache
+
+
+def _shared_free_ids() -> FrozenSet[int]:
+    cache = _request_cache()
+    free_ids = cache.get("free_ids") if cache is not None else None
+    if free_ids is None:
+        free_ids = frozenset(books_sync.list_free_book_ids())
+        if cache is not None:
+            cache["free_ids"] = free_ids
+    return free_ids
+
+
+def _load_catalog_state(
+    *,
+    calibre_user_id: Optional[int],
+    email: Optional[str],
+    is_admin: bool,
+) -> UserCatalogState:
+    free_ids = _shared_free_ids()
     if is_admin:
         return UserCatalogState(
             is_admin=True,
             is_authenticated=True,
-            purchased_book_ids=set(),
+            purchased_book_ids=frozenset(),
             free_book_ids=free_ids,
         )
 
-    normalized_email = normalize_email(email)
     is_authenticated = calibre_user_id is not None
-    orders = users_books_repo.list_orders_for_user(
+    links = users_books_repo.list_order_links_for_user(
         calibre_user_id=calibre_user_id,
-        email=normalized_email,
+        email=email,
     )
     purchased_ids: Set[int] = set()
     handles_missing: Set[str] = set()
-    for order in orders:
-        book_id = getattr(order, "calibre_book_id", None)
+    for book_id, handle in links:
         if book_id is None:
-            handle = getattr(order, "mz_handle", None)
             if isinstance(handle, str) and handle.strip():
                 handles_missing.add(handle.strip())
             continue
@@ -110,7 +174,7 @@ def build_catalog_state(
     state = UserCatalogState(
         is_admin=False,
         is_authenticated=is_authenticated,
-        purchased_book_ids=purchased_ids,
+        purchased_book_ids=frozenset(purchased_ids),
         free_book_ids=free_ids,
     )
 
@@ -121,4 +185,5 @@ __all__ = [
     "BookState",
     "UserCatalogState",
     "build_catalog_state",
+    "invalidate_catalog_state_cache",
 ]
@@ -49,7 +49,24 @@ LOG = get_logger("email_delivery")
 _BOOK_PURCHASE_KEY = "book_purchase"
 _PASSWORD_RESET_KEY = "password_reset"
 _LANG_ORDER = tuple(allowed_languages()) or ("en",)
-_JINJA_ENV = Environment(loader=BaseLoader(), autoescape=False, trim_blocks=True, lstrip_blocks=True)
+
+
+class _SourceLoader(BaseLoader):
+    """Treat the template name as its source so get_template hits Jinja's cache."""
+
+    def get_source(self, environment, template):
+        return template, None, lambda: True
+
+
+# Templates are edited in the admin UI; an edited source is simply a new cache
+# key, and Jinja's LRU (cache_size) evicts the stale compiled version.
+_JINJA_ENV = Environment(
+    loader=_SourceLoader(),
+    autoescape=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    cache_size=64,
+)
 _HTML_BREAK_PATTERN = re.compile(r"</p>|<br\s*/?>", re.IGNORECASE)
 _TAG_PATTERN = re.compile(r"<[^>]+>")
 
@@ -140,7 +157,7 @@ def absolute_site_url(path: str) -> str:
 
 def _render_template(template_str: str, context: Dict[str, object]) -> str:
     try:
-        template = _JINJA_ENV.from_string(template_str or "")
+        template = _JINJA_ENV.get_template(template_str or "")
         return template.render(**context)
     except TemplateError as exc:  # pragma: no cover - guarded by admin UI validation
         raise EmailDeliveryError("template_render_failed") from exc
@@ -168,13 +185,11 @@ def _mail_settings() -> Dict[str, object]:
 
 
 def _load_template(template_key: str, language: str):
-    record = email_templates_repo.get_template(template_key, language)
-    if record:
-        return record
-    for fallback in _LANG_ORDER:
-        if fallback == language:
-            continue
-        record = email_templates_repo.get_template(template_key, fallback)
+    # Requested language plus every fallback in one query.
+    order = [language] + [lang for lang in _LANG_ORDER if lang != language]
+    records = email_templates_repo.get_templates((template_key, lang) for lang in order)
+    for lang in order:
+        record = records.get((template_key, lang))
         if record:
             return record
     raise TemplateMissingError(f"{template_key}_template_missing")
@@ -4,6 +4,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 
+from app.db.models import EmailTemplate
 from app.db.repositories import email_templates_repo
 
 
@@ -85,7 +86,15 @@ def _normalize_subject(subject: Optional[str]) -> str:
 
 
 def fetch_templates_context() -> Dict[str, List[Dict[str, object]]]:
-    records = email_templates_repo.list_templates()
+    records = email_templates_repo.list_templates(
+        columns=(
+            EmailTemplate.template_key,
+            EmailTemplate.language,
+            EmailTemplate.subject,
+            EmailTemplate.html_body,
+            EmailTemplate.updated_at,
+        )
+    )
     lookup: Dict[tuple[str, str], TemplateLanguageView] = {}
     for record in records:
         lookup[(record.template_key, record.language)] = TemplateLanguageView(
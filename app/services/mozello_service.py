@@ -8,7 +8,7 @@ Responsibilities:
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List, Tuple, Optional, Dict, Any, Set, Iterable
+from typing import List, Mapping, Tuple, Optional, Dict, Any, Set, Iterable
 import hmac, hashlib, base64, json, time, threading
 from datetime import datetime
 from urllib.parse import quote_plus, urlsplit
@@ -37,6 +37,10 @@ _CATEGORY_CACHE_LOCK = threading.Lock()
 
 _STORE_URL_LANGUAGES = ("lv", "ru", "en")
 
+# Shared session so consecutive Mozello API calls reuse pooled keep-alive
+# connections instead of paying a TCP/TLS handshake per request.
+_HTTP = requests.Session()
+
 
 @dataclass
 class _ProductUrlCacheEntry:
@@ -48,6 +52,13 @@ _PRODUCT_URL_CACHE: Dict[tuple[str, str], _ProductUrlCacheEntry] = {}
 _PRODUCT_URL_CACHE_TTL = 600.0  # seconds
 _PRODUCT_URL_CACHE_LOCK = threading.Lock()
 
+# Resolved API key (or None), its UTF-8 HMAC key bytes and its fetch time; every
+# webhook and outbound call needs it, so avoid a mozello_config read per call. The TTL bounds staleness in
+# other workers after the key is changed through the admin UI.
+_API_KEY_CACHE: Optional[Tuple[Optional[str], Optional[bytes], float]] = None
+_API_KEY_CACHE_TTL = 60.0  # seconds
+_API_KEY_CACHE_LOCK = threading.Lock()
+
 
 def _normalize_category_path(value: str) -> str:
     parts = [segment.strip("/") for segment in value.split("/") if segment.strip("/")]
@@ -84,7 +95,7 @@ def fetch_category(handle: str, timeout: int = 10) -> Tuple[bool, Dict[str, Any]
         return False, {"error": "handle_required"}
     try:
         _throttle_wait()
-        r = requests.get(_api_url(f"/store/category/{target}/"), headers=headers, timeout=timeout)
+        r = _HTTP.get(_api_url(f"/store/category/{target}/"), headers=headers, timeout=timeout)
         try:
             data = r.json()
         except Exception:
@@ -417,23 +428,45 @@ def resolve_product_storefront_url(
     return None
 
 
+def _api_key_entry() -> Tuple[Optional[str], Optional[bytes], float]:
+    global _API_KEY_CACHE
+    now = time.time()
+    with _API_KEY_CACHE_LOCK:
+        cached = _API_KEY_CACHE
+    if cached is not None and now - cached[2] < _API_KEY_CACHE_TTL:
+        return cached
+    key = _load_api_key()
+    entry = (key, key.encode("utf-8") if key else None, now)
+    with _API_KEY_CACHE_LOCK:
+        _API_KEY_CACHE = entry
+    return entry
+
+
 def _resolve_api_key() -> Optional[str]:
+    return _api_key_entry()[0]
+
+
+def _invalidate_api_key_cache() -> None:
+    global _API_KEY_CACHE
+    with _API_KEY_CACHE_LOCK:
+        _API_KEY_CACHE = None
+
+
+def _load_api_key() -> Optional[str]:
     cfg = _get_singleton(create=False)
     if cfg and cfg.api_key:
         cleaned = cfg.api_key.strip()
         if cleaned:
             return cleaned
-    env_key = config.mozello_api_key()
+    env_key = config.mozello_api_key()  # already stripped, None when blank
     if env_key:
-        cleaned_env = env_key.strip()
-        if cleaned_env:
-            if not cfg or not (cfg.api_key and cfg.api_key.strip()):
-                try:
-                    update_settings(cleaned_env, None, None)
-                    LOG.info("Mozello API key seeded from environment into mozello_config table.")
-                except Exception:  # pragma: no cover - best effort
-                    LOG.warning("Failed persisting Mozello API key from environment", exc_info=True)
-            return cleaned_env
+        if not cfg or not (cfg.api_key and cfg.api_key.strip()):
+            try:
+                update_settings(env_key, None, None)
+                LOG.info("Mozello API key seeded from environment into mozello_config table.")
+            except Exception:  # pragma: no cover - best effort
+                LOG.warning("Failed persisting Mozello API key from environment", exc_info=True)
+        return env_key
     return None
 
 
@@ -626,6 +659,7 @@ def invalidate_cache() -> None:
             _PRODUCT_URL_CACHE.clear()
     except Exception:  # pragma: no cover
         pass
+    _invalidate_api_key_cache()
 def get_app_settings() -> Dict[str, Any]:
     seeded_key = _resolve_api_key()
     _seed_store_url_from_env()
@@ -733,10 +767,9 @@ def _get_singleton(create: bool = True) -> MozelloConfig:
         if obj is None and create:
             obj = MozelloConfig(id=1)
             s.add(obj)
-        # session commits on context exit
-    # re-open to get refreshed state
-    with app_session() as s2:
-        return s2.get(MozelloConfig, 1)  # type: ignore
+        # session commits on context exit; expire_on_commit=False keeps the
+        # flushed state (including defaults) readable without a second query
+    return obj  # type: ignore
 
 
 def get_settings() -> Dict[str, Any]:
@@ -766,27 +799,28 @@ def update_settings(api_key: Optional[str], notifications_url: Optional[str], ev
             bool(sanitized_key or cfg.api_key),
         )
 
-    return get_settings()
+    if api_key is not None:
+        _invalidate_api_key_cache()
+    return cfg.as_dict()
 
 
 def allowed_events() -> List[str]:
     return list(MozelloConfig.ALLOWED_EVENTS)
 
 
-def verify_signature(raw_body: bytes, provided_hash: str, api_key: str) -> bool:
-    expected = base64.b64encode(hmac.new(api_key.encode("utf-8"), raw_body, hashlib.sha256).digest()).decode()
-    try:
-        return hmac.compare_digest(expected, provided_hash or "")
-    except Exception:
-        return False
+def verify_signature(raw_body: bytes, provided_hash: str, api_key: str | bytes) -> bool:
+    key = api_key if isinstance(api_key, bytes) else api_key.encode("utf-8")
+    expected = base64.b64encode(hmac.new(key, raw_body, hashlib.sha256).digest())
+    # Constant-time over bytes (str compare_digest rejects non-ASCII input).
+    return hmac.compare_digest(expected, (provided_hash or "").encode("utf-8"))
 
 
-def handle_webhook(raw_body: bytes, headers: Dict[str, str]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
+def handle_webhook(raw_body: bytes, headers: Mapping[str, str]) -> Tuple[bool, str, Optional[Dict[str, Any]]]:
     """Verify and parse inbound Mozello webhook payload.
 
     Returns (accepted, event, payload). Payload is None when rejected.
     """
-    api_key = _resolve_api_key()
+    api_key = _api_key_entry()[1]
     if not api_key:
         return False, "api_key_not_configured", None
     provided = headers.get("X-Mozello-Hash") or headers.get("x-mozello-hash", "")
@@ -796,11 +830,13 @@ def handle_webhook(raw_body: bytes, headers: Dict[str, str]) -> Tuple[bool, str,
     else:
         if not verify_signature(raw_body, provided, api_key):
             return False, "signature_invalid", None
-    # Parse JSON (defensive)
+    # Parse JSON once, straight from the signed bytes (defensive)
     try:
-        payload = json.loads(raw_body.decode("utf-8"))
+        payload = json.loads(raw_body)
     except Exception:
         return False, "invalid_json", None
+    if not isinstance(payload, dict):
+        return False, "invalid_json", None
     evt_raw = payload.get("event")
     evt = str(evt_raw).strip().upper() if evt_raw else ""
     order_info = payload.get("order") if isinstance(payload.get("order"), dict) else None
@@ -892,7 +928,7 @@ def fetch_remote_notifications(timeout: int = 10) -> Tuple[bool, Dict[str, Any]]
         headers = _api_headers()
         if not headers:
             return False, {"error": "api_key_missing"}
-        r = requests.get(f"{base}/store/notifications/", headers=headers, timeout=timeout)
+        r = _HTTP.get(f"{base}/store/notifications/", headers=headers, timeout=timeout)
         status = r.status_code
         text_body = r.text
         # Attempt JSON parsing regardless of status
@@ -919,7 +955,7 @@ def push_remote_notifications(url: Optional[str], events: List[str], timeout: in
         headers = _api_headers()
         if not headers:
             return False, {"error": "api_key_missing"}
-        r = requests.put(f"{base}/store/notifications/", json=body, headers=headers, timeout=timeout)
+        r = _HTTP.put(f"{base}/store/notifications/", json=body, headers=headers, timeout=timeout)
         status = r.status_code
         text_body = r.text
         try:
@@ -1011,7 +1047,7 @@ def list_products_full(page_size: int = 100, max_pages: int = 200) -> Tuple[bool
     try:
         while next_url and pages < max_pages:
             _throttle_wait()
-            r = requests.get(next_url, headers=headers, timeout=15)
+            r = _HTTP.get(next_url, headers=headers, timeout=15)
             pages += 1
             status = r.status_code
             try:
@@ -1052,7 +1088,7 @@ def fetch_product(handle: str, timeout: int = 10) -> Tuple[bool, Dict[str, Any]]
         return False, {"error": "handle_required"}
     try:
         _throttle_wait()
-        r = requests.get(_api_url(f"/store/product/{target}/"), headers=headers, timeout=timeout)
+        r = _HTTP.get(_api_url(f"/store/product/{target}/"), headers=headers, timeout=timeout)
         try:
             data = r.json()
         except Exception:
@@ -1088,12 +1124,12 @@ def upsert_product_minimal(handle: str, title: str, price: float | None) -> Tupl
     # Update first
     try:
         _throttle_wait()
-        r = requests.put(_api_url(f"/store/product/{clean_handle}/"), json=body, headers=headers, timeout=15)
+        r = _HTTP.put(_api_url(f"/store/product/{clean_handle}/"), json=body, headers=headers, timeout=15)
         if r.status_code == 404:
             # Create
             create_body = {"product": {"handle": clean_handle, "title": {"en": title}, "price": price or 0.0, "visible": True, "url": url_multi}}
             _throttle_wait()
-            r = requests.post(_api_url("/store/product/"), json=create_body, headers=headers, timeout=15)
+            r = _HTTP.post(_api_url("/store/product/"), json=create_body, headers=headers, timeout=15)
         try:
             data = r.json()
         except Exception:
@@ -1166,7 +1202,7 @@ def upsert_product_basic(
 
     try:
         _throttle_wait()
-        update_resp = requests.put(
+        update_resp = _HTTP.put(
             _api_url(f"/store/product/{clean_handle}/"),
             json=update_payload,
             headers=headers,
@@ -1231,7 +1267,7 @@ def upsert_product_basic(
     create_payload = create_body
     try:
         _throttle_wait()
-        create_resp = requests.post(
+        create_resp = _HTTP.post(
             _api_url("/store/product/"),
             json=create_body,
             headers=headers,
@@ -1297,7 +1333,7 @@ def update_product_price(handle: str, price: float | None) -> Tuple[bool, Dict[s
     payload = {"product": {"price": price_value}}
     try:
         _throttle_wait()
-        resp = requests.put(_api_url(f"/store/product/{clean_handle}/"), json=payload, headers=headers, timeout=15)
+        resp = _HTTP.put(_api_url(f"/store/product/{clean_handle}/"), json=payload, headers=headers, timeout=15)
         try:
             data = resp.json()
         except Exception:
@@ -1319,7 +1355,7 @@ def delete_product(handle: str) -> Tuple[bool, Dict[str, Any]]:
         return False, {"error": "api_key_missing"}
     try:
         _throttle_wait()
-        r = requests.delete(_api_url(f"/store/product/{handle}/"), headers=headers, timeout=15)
+        r = _HTTP.delete(_api_url(f"/store/product/{handle}/"), headers=headers, timeout=15)
         if r.status_code == 404:
             return True, {"status": "not_found"}
         try:
@@ -1361,7 +1397,7 @@ def fetch_paid_orders(
     try:
         while next_url and pages < max_pages:
             _throttle_wait()
-            r = requests.get(next_url, headers=headers, timeout=20)
+            r = _HTTP.get(next_url, headers=headers, timeout=20)
             pages += 1
             status = r.status_code
             try:
@@ -1413,7 +1449,7 @@ def add_product_picture(handle: str, b64_image: str, filename: str | None = None
     body = {"picture": picture_obj}
     try:
         _throttle_wait()
-        r = requests.post(_api_url(f"/store/product/{handle}/picture/"), json=body, headers=headers, timeout=30)
+        r = _HTTP.post(_api_url(f"/store/product/{handle}/picture/"), json=body, headers=headers, timeout=30)
         try:
             data = r.json()
         except Exception:
@@ -1441,7 +1477,7 @@ def list_product_pictures(handle: str) -> Tuple[bool, Dict[str, Any]]:
         return False, {"error": "handle_required"}
     try:
         _throttle_wait()
-        r = requests.get(_api_url(f"/store/product/{clean_handle}/pictures/"), headers=headers, timeout=15)
+        r = _HTTP.get(_api_url(f"/store/product/{clean_handle}/pictures/"), headers=headers, timeout=15)
         try:
             data = r.json()
         except Exception:
@@ -1471,7 +1507,7 @@ def delete_product_picture(handle: str, picture_uid: str) -> Tuple[bool, Dict[st
         return False, {"error": "picture_uid_required"}
     try:
         _throttle_wait()
-        r = requests.delete(_api_url(f"/store/product/{clean_handle}/picture/{uid}/"), headers=headers, timeout=15)
+        r = _HTTP.delete(_api_url(f"/store/product/{clean_handle}/picture/{uid}/"), headers=headers, timeout=15)
         try:
             data = r.json()
         except Exception:
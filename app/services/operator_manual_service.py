@@ -1,13 +1,14 @@
 """Operator manual loader (non-technical docs/operator).
 
-Reads the current markdown files at request-time so updates to files are
-reflected immediately.
+Stats the markdown files at request-time so updates to files are reflected
+immediately; the converted HTML is reused while their mtimes are unchanged.
 """
 
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import Iterable
+from typing import Dict, Iterable, List, Tuple
 
 from app.utils.logging import get_logger
 
@@ -38,18 +39,38 @@ def _manual_sections() -> Iterable[str]:
     return ("admin_hub", "user_management", "books_management")
 
 
-def load_operator_manual_markdown(language: str) -> str:
-    suffix = _language_suffix(language)
-    parts: list[str] = []
-    base_dir = _docs_dir()
+# suffix -> ((path, mtime) per section file, rendered HTML)
+_HTML_CACHE: Dict[str, Tuple[Tuple[Tuple[str, float], ...], str]] = {}
+_HTML_CACHE_LOCK = threading.Lock()
+
 
+def _section_paths(suffix: str) -> List[Path]:
+    base_dir = _docs_dir()
+    paths: List[Path] = []
     for name in _manual_sections():
-        filename = f"{name}{suffix}.md"
-        path = base_dir / filename
+        path = base_dir / f"{name}{suffix}.md"
         if not path.exists():
             # Fall back to English if localized file is missing.
-            fallback = base_dir / f"{name}.md"
-            path = fallback
+            path = base_dir / f"{name}.md"
+        paths.append(path)
+    return paths
+
+
+def _mtime_signature(paths: Iterable[Path]) -> Tuple[Tuple[str, float], ...]:
+    signature: List[Tuple[str, float]] = []
+    for path in paths:
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            mtime = -1.0
+        signature.append((str(path), mtime))
+    return tuple(signature)
+
+
+def load_operator_manual_markdown(language: str) -> str:
+    parts: list[str] = []
+
+    for name, path in zip(_manual_sections(), _section_paths(_language_suffix(language))):
         try:
             parts.append(path.read_text(encoding="utf-8"))
         except Exception:
@@ -59,9 +80,7 @@ def load_operator_manual_markdown(language: str) -> str:
     return "\n\n---\n\n".join(parts)
 
 
-def render_operator_manual_html(language: str) -> str:
-    markdown_text = load_operator_manual_markdown(language)
-
+def _markdown_to_html(markdown_text: str) -> str:
     try:
         from markdown2 import Markdown  # type: ignore
 
@@ -75,6 +94,19 @@ def render_operator_manual_html(language: str) -> str:
         return f"<pre style=\"white-space: pre-wrap;\">{escaped}</pre>"
 
 
+def render_operator_manual_html(language: str) -> str:
+    suffix = _language_suffix(language)
+    signature = _mtime_signature(_section_paths(suffix))
+    with _HTML_CACHE_LOCK:
+        cached = _HTML_CACHE.get(suffix)
+    if cached and cached[0] == signature:
+        return cached[1]
+    manual_html = _markdown_to_html(load_operator_manual_markdown(language))
+    with _HTML_CACHE_LOCK:
+        _HTML_CACHE[suffix] = (signature, manual_html)
+    return manual_html
+
+
 __all__ = [
     "load_operator_manual_markdown",
     "render_operator_manual_html",
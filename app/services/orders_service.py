@@ -3,14 +3,15 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone, time
-from typing import Any, Dict, List, Optional, Set
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set, Tuple
 import json
 
 from app.db.models import MozelloOrder
 from app.db.repositories import users_books_repo
 from app.db.repositories.users_books_repo import OrderExistsError as RepoOrderExistsError
 from app.services import books_sync, mozello_service, password_reset_service, email_delivery
-from app.services import shelves_service
+from app.services import catalog_access, shelves_service
 from app.services.calibre_users_service import (
     CalibreUnavailableError,
     UserAlreadyExistsError,
@@ -54,8 +55,15 @@ class OrderView:
     imported_at: Optional[str]
 
 
+@lru_cache(maxsize=4096)
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    # Orders imported together share one timestamp, so listings format each
+    # distinct value once instead of once per row.
+    return value.isoformat() if value else None
+
+
 def _order_to_view(
-    order: MozelloOrder,
+    order: MozelloOrder | users_books_repo.OrderRow,
     book: Optional[Dict[str, Any]],
     user: Optional[Dict[str, Any]],
 ) -> OrderView:
@@ -68,13 +76,13 @@ def _order_to_view(
         calibre_user=user,
         book_error=book_error,
         user_missing=user is None,
-        created_at=order.created_at.isoformat() if order.created_at else None,
-        imported_at=order.updated_at.isoformat() if order.updated_at else None,
+        created_at=_isoformat(order.created_at),
+        imported_at=_isoformat(order.updated_at),
     )
 
 
 def list_orders() -> Dict[str, Any]:
-    orders = users_books_repo.list_orders()
+    orders = users_books_repo.list_order_rows()
     if not orders:
         return {"orders": [], "summary": {"total": 0, "linked_books": 0, "linked_users": 0}}
 
@@ -108,6 +116,7 @@ def list_orders() -> Dict[str, Any]:
         updates.append((order_id, payload["user"], payload["book"]))
     if updates:
         users_books_repo.bulk_update_links(updates)
+        catalog_access.invalidate_catalog_state_cache()
 
     summary = {
         "total": len(orders),
@@ -141,6 +150,7 @@ def create_order(email: str, mz_handle: str) -> Dict[str, Any]:
         )
     except RepoOrderExistsError as exc:
         raise OrderAlreadyExistsError("order_exists") from exc
+    catalog_access.invalidate_catalog_state_cache()
 
     LOG.info(
         "Created Mozello order email=%s mz_handle=%s user_id=%s book_id=%s",
@@ -171,6 +181,7 @@ def create_user_for_order(
     if existing_user:
         if not order.calibre_user_id:
             users_books_repo.update_links(order.id, calibre_user_id=existing_user.get("id"))
+            catalog_access.invalidate_catalog_state_cache()
             order.calibre_user_id = existing_user.get("id")
         view_existing = _order_to_view(order, book_info, existing_user)
         return {
@@ -190,6 +201,7 @@ def create_user_for_order(
         refreshed = lookup_user_by_email(order.email)
         if refreshed:
             users_books_repo.update_links(order.id, calibre_user_id=refreshed.get("id"))
+            catalog_access.invalidate_catalog_state_cache()
             order.calibre_user_id = refreshed.get("id")
             view_refreshed = _order_to_view(order, book_info, refreshed)
             return {
@@ -203,6 +215,7 @@ def create_user_for_order(
         raise CalibreUnavailableError("calibre_unavailable") from exc
 
     users_books_repo.update_links(order.id, calibre_user_id=user_info.get("id"))
+    catalog_access.invalidate_catalog_state_cache()
     order.calibre_user_id = user_info.get("id")
 
     view = _order_to_view(order, book_info, user_info)
@@ -218,12 +231,16 @@ def refresh_order(order_id: int) -> Dict[str, Any]:
     book_info = book_map.get(order.mz_handle.lower()) if order.mz_handle else None
     user_info = lookup_user_by_email(order.email)
 
-    if book_info and order.calibre_book_id != book_info.get("book_id"):
-        users_books_repo.update_links(order.id, calibre_book_id=book_info.get("book_id"))
-        order.calibre_book_id = book_info.get("book_id")
-    if user_info and order.calibre_user_id != user_info.get("id"):
-        users_books_repo.update_links(order.id, calibre_user_id=user_info.get("id"))
-        order.calibre_user_id = user_info.get("id")
+    new_book_id = book_info.get("book_id") if book_info and order.calibre_book_id != book_info.get("book_id") else None
+    new_user_id = user_info.get("id") if user_info and order.calibre_user_id != user_info.get("id") else None
+    if new_book_id is not None or new_user_id is not None:
+        # Single update_links call: both links land in one transaction/commit.
+        users_books_repo.update_links(order.id, calibre_user_id=new_user_id, calibre_book_id=new_book_id)
+        catalog_access.invalidate_catalog_state_cache()
+        if new_book_id is not None:
+            order.calibre_book_id = new_book_id
+        if new_user_id is not None:
+            order.calibre_user_id = new_user_id
 
     view = _order_to_view(order, book_info, user_info)
     return {"order": view.__dict__, "status": "refreshed"}
@@ -233,6 +250,7 @@ def delete_order(order_id: int) -> Dict[str, Any]:
     removed = users_books_repo.delete_order(order_id)
     if not removed:
         raise OrderNotFoundError("order_missing")
+    catalog_access.invalidate_catalog_state_cache()
     return {"status": "deleted"}
 
 
@@ -329,9 +347,10 @@ def import_paid_orders(
         "errors": [],
     }
     created_ids: List[int] = []
+    pending: List[Tuple[str, str, Optional[int], Optional[int], Optional[datetime]]] = []
 
     existing_pairs: Set[tuple[str, str]] = set()
-    for record in users_books_repo.list_orders():
+    for record in users_books_repo.list_order_rows():
         email_key = normalize_email(record.email)
         handle_key = (record.mz_handle or "").strip().lower()
         if not email_key or not handle_key:
@@ -375,34 +394,39 @@ def import_paid_orders(
             book_info = book_map.get(handle_key)
             calibre_user_id = user_info.get("id") if user_info else None
             calibre_book_id = book_info.get("book_id") if book_info else None
-            try:
-                order = users_books_repo.create_order(
-                    email_norm,
-                    handle_raw,
-                    calibre_user_id=calibre_user_id,
-                    calibre_book_id=calibre_book_id,
-                    created_at=moz_created_at,
-                    imported_at=imported_at_ts,
-                )
-                summary["created"] += 1
-                created_ids.append(order.id)
-                existing_pairs.add(pair_key)
-            except RepoOrderExistsError:
-                summary["skipped_existing"] += 1
-                users_books_repo.mark_imported(
-                    email_norm,
-                    handle_raw,
-                    imported_at_ts,
-                    calibre_user_id=calibre_user_id,
-                    calibre_book_id=calibre_book_id,
-                )
-            except Exception as exc:  # pragma: no cover - defensive
-                summary["errors"].append({
-                    "email": email_norm,
-                    "handle": handle_raw,
-                    "error": str(exc),
-                })
-                LOG.warning("Mozello import failed email=%s handle=%s error=%s", email_norm, handle_raw, exc)
+            pending.append((email_norm, handle_raw, calibre_user_id, calibre_book_id, moz_created_at))
+            existing_pairs.add(pair_key)
+
+    # All new orders go in with one INSERT; pairs that appeared concurrently
+    # (e.g. via webhook) are skipped by the repository and only marked imported.
+    try:
+        inserted = users_books_repo.create_orders(pending, imported_at=imported_at_ts)
+    except Exception as exc:  # pragma: no cover - defensive
+        inserted = []
+        for email_norm, handle_raw, _user_id, _book_id, _created in pending:
+            summary["errors"].append({
+                "email": email_norm,
+                "handle": handle_raw,
+                "error": str(exc),
+            })
+        LOG.warning("Mozello import failed for %s orders error=%s", len(pending), exc)
+        pending = []
+    inserted_pairs = {(email, handle) for _order_id, email, handle in inserted}
+    created_ids.extend(order_id for order_id, _email, _handle in inserted)
+    summary["created"] += len(inserted)
+    for email_norm, handle_raw, calibre_user_id, calibre_book_id, _created in pending:
+        if (email_norm, handle_raw) in inserted_pairs:
+            continue
+        summary["skipped_existing"] += 1
+        users_books_repo.mark_imported(
+            email_norm,
+            handle_raw,
+            imported_at_ts,
+            calibre_user_id=calibre_user_id,
+            calibre_book_id=calibre_book_id,
+        )
+    if pending:
+        catalog_access.invalidate_catalog_state_cache()
 
     summary["skipped"] = summary["skipped_existing"] + summary["skipped_filtered"]
     summary["created_ids"] = created_ids
@@ -466,10 +490,10 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
         and normalize_email(moz_customer_name) != normalize_email(existing_user.get("email"))
     ):
         try:
-            update_user_display_name(int(existing_user["id"]), moz_customer_name)
-            refreshed = lookup_user_by_email(email_norm)
-            if refreshed:
-                existing_user = refreshed
+            # The update returns the saved user, so no second lookup is needed.
+            updated_user = update_user_display_name(int(existing_user["id"]), moz_customer_name)
+            if isinstance(updated_user, dict) and updated_user.get("id") is not None:
+                existing_user = updated_user
         except Exception:
             LOG.debug("Failed updating user display name from Mozello order", exc_info=True)
 
@@ -508,6 +532,24 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
     initial_password: Optional[str] = None
     wishlist_created = False
 
+    # New (email, handle) pairs go in with one INSERT ... ON CONFLICT DO NOTHING;
+    # pairs that already exist are updated per handle below.
+    initial_user_id = existing_user.get("id") if existing_user else None
+    inserted = users_books_repo.create_orders(
+        (
+            (
+                email_norm,
+                handle,
+                initial_user_id,
+                (book_map.get(handle.lower()) or {}).get("book_id"),
+                moz_created_at,
+            )
+            for handle in handles
+        ),
+        imported_at=imported_at,
+    )
+    inserted_ids = {mz_handle: order_id for order_id, _email, mz_handle in inserted}
+
     for handle in handles:
         handle_key = handle.lower()
         book_info = book_map.get(handle_key)
@@ -531,20 +573,18 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
             if book_id_int not in book_ids_seen:
                 book_ids_seen.add(book_id_int)
                 book_ids_for_token.append(book_id_int)
-        created = False
-        order_obj: Optional[MozelloOrder]
-        try:
-            order_obj = users_books_repo.create_order(
-                email_norm,
-                handle,
-                calibre_user_id=calibre_user_id,
-                calibre_book_id=calibre_book_id,
-                created_at=moz_created_at,
-                imported_at=imported_at,
-            )
-            created = True
+        created = handle in inserted_ids
+        order_id: Optional[int]
+        order_user_id: Optional[int]
+        if created:
             summary["orders_created"] += 1
-        except RepoOrderExistsError:
+            order_id = inserted_ids[handle]
+            order_user_id = initial_user_id
+            if order_user_id is None and calibre_user_id is not None:
+                # The user was created while handling an earlier cart item.
+                users_books_repo.update_links(order_id, calibre_user_id=calibre_user_id)
+                order_user_id = calibre_user_id
+        else:
             summary["orders_existing"] += 1
             order_obj = users_books_repo.mark_imported(
                 email_norm,
@@ -555,8 +595,10 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
             )
             if not order_obj:
                 order_obj = users_books_repo.get_order_by_email_handle(email_norm, handle)
+            order_id = order_obj.id if order_obj else None
+            order_user_id = order_obj.calibre_user_id if order_obj else None
 
-        if not order_obj:
+        if order_id is None:
             LOG.warning("Webhook Mozello order missing after persistence email=%s handle=%s", email_norm, handle)
             summary["errors"].append({"handle": handle, "error": "order_missing"})
             summary["orders"].append({
@@ -567,12 +609,12 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
             })
             continue
 
-        user_status = "already_linked" if order_obj.calibre_user_id else None
+        user_status = "already_linked" if order_user_id else None
 
-        if not order_obj.calibre_user_id:
+        if not order_user_id:
             try:
                 ensure_resp = create_user_for_order(
-                    order_obj.id,
+                    order_id,
                     preferred_username=moz_customer_name,
                     preferred_language=language_hint,
                 )
@@ -639,12 +681,14 @@ def process_webhook_order(order_payload: Dict[str, Any]) -> Dict[str, Any]:
             summary["user_linked"] += 1
 
         summary["orders"].append({
-            "order_id": order_obj.id,
+            "order_id": order_id,
             "mz_handle": handle,
             "status": "created" if created else "existing",
             "user_status": user_status,
         })
 
+    # One invalidation for the whole cart, after inserts and link updates.
+    catalog_access.invalidate_catalog_state_cache()
     summary["books_included"] = len(books_for_email)
     auth_token: Optional[str] = None
     if initial_password:
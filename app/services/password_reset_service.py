@@ -1,6 +1,7 @@
 """Password reset helpers coordinating auth links + Calibre state."""
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, List, Optional
 
@@ -22,6 +23,11 @@ from app.utils.logging import get_logger
 LOG = get_logger("password_reset_service")
 _INITIAL = "initial"
 _RESET = "reset"
+# Expired token rows are pruned by a background sweep rather than on every
+# token read/write; see start_token_sweeper.
+_SWEEP_INTERVAL_SECONDS = 6 * 60 * 60
+_SWEEPER: Optional[threading.Timer] = None
+_SWEEPER_LOCK = threading.Lock()
 
 
 class PasswordResetError(RuntimeError):
@@ -57,6 +63,9 @@ def _sanitize_book_ids(book_ids: Optional[Any]) -> List[int]:
         return []
     if not isinstance(book_ids, list):
         raise PasswordResetError("book_ids_invalid")
+    # Fast path: ids already decoded as plain ints (bools excluded) need no coercion.
+    if set(map(type, book_ids)) <= {int}:
+        return list(book_ids)
     try:
         return [int(value) for value in book_ids]
     except (TypeError, ValueError) as exc:
@@ -189,6 +198,42 @@ def purge_expired_records(*, older_than_days: int = 30) -> int:
     return reset_passwords_repo.purge_expired_tokens(older_than_days=older_than_days)
 
 
+def _sweep_expired_tokens(interval: float) -> None:
+    global _SWEEPER
+    try:
+        removed = purge_expired_records()
+        if removed:
+            LOG.info("Pruned %s expired password tokens", removed)
+    except Exception:  # pragma: no cover - keep the sweep alive
+        LOG.warning("Password token sweep failed", exc_info=True)
+    with _SWEEPER_LOCK:
+        if _SWEEPER is None:  # stopped meanwhile
+            return
+        _SWEEPER = threading.Timer(interval, _sweep_expired_tokens, args=(interval,))
+        _SWEEPER.daemon = True
+        _SWEEPER.start()
+
+
+def start_token_sweeper(*, interval: float = _SWEEP_INTERVAL_SECONDS) -> None:
+    """Prune expired tokens now and then every ``interval`` seconds (idempotent)."""
+
+    global _SWEEPER
+    with _SWEEPER_LOCK:
+        if _SWEEPER is not None:
+            return
+        _SWEEPER = threading.Timer(0, _sweep_expired_tokens, args=(interval,))
+        _SWEEPER.daemon = True
+        _SWEEPER.start()
+
+
+def stop_token_sweeper() -> None:
+    global _SWEEPER
+    with _SWEEPER_LOCK:
+        timer, _SWEEPER = _SWEEPER, None
+    if timer is not None:
+        timer.cancel()
+
+
 def has_pending_token(*, email: str, initial: bool) -> bool:
     normalized = _require_email(email)
     token_type = _INITIAL if initial else _RESET
@@ -202,6 +247,8 @@ __all__ = [
     "resolve_pending_reset",
     "complete_password_change",
     "purge_expired_records",
+    "start_token_sweeper",
+    "stop_token_sweeper",
     "has_pending_token",
     "PendingReset",
     "PasswordResetError",
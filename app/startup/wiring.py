@@ -15,9 +15,11 @@ from app.config import (
     admin_bootstrap_enabled,
     admin_bootstrap_email,
     admin_bootstrap_password,
+    jinja_bytecode_cache_dir,
 )
 from app.services import mozello_service
 from app.services import calibre_users_service
+from app.services import password_reset_service
 from app.i18n import (
     configure_translations,
     patch_anonymous_user_locale,
@@ -27,6 +29,7 @@ from app.i18n import (
 from app.utils.currency import register_currency_filters
 from app.utils.logging import get_logger
 from flask import Blueprint
+from jinja2 import FileSystemBytecodeCache
 import os
 
 LOG = get_logger("app.startup")
@@ -71,6 +74,27 @@ def _prepend_template_path(app):
             LOG.debug("Appended repo root to jinja searchpath: %s", repo_root)
 
 
+def _configure_jinja_bytecode_cache(app) -> None:
+    """Persist compiled template bytecode so worker restarts skip re-parsing.
+
+    Entries are keyed by template name and source checksum, so templates
+    patched in memory by the nav loader wrapper get their own entries.
+    """
+    env = getattr(app, "jinja_env", None)
+    if env is None or env.bytecode_cache is not None:
+        return
+    cache_dir = jinja_bytecode_cache_dir()
+    if not cache_dir:
+        return
+    try:
+        os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+    except OSError as exc:
+        LOG.warning("Jinja bytecode cache disabled (cannot create %s): %s", cache_dir, exc)
+        return
+    env.bytecode_cache = FileSystemBytecodeCache(directory=cache_dir, pattern="__ebookslv_jinja_%s.cache")
+    LOG.debug("Jinja bytecode cache enabled at %s", cache_dir)
+
+
 def _maybe_bootstrap_admin_password() -> None:
     if not admin_bootstrap_enabled():
         return
@@ -112,7 +136,9 @@ def init_app(app: Any) -> None:
         LOG.exception("Failed seeding Mozello API key from environment")
 
     _maybe_bootstrap_admin_password()
+    password_reset_service.start_token_sweeper()
     _prepend_template_path(app)
+    _configure_jinja_bytecode_cache(app)
     register_currency_filters(app)
     configure_translations(app)
     patch_locale_selector(app)
@@ -0,0 +1,128 @@
+(function() {
+	'use strict';
+
+	function getUrls(root) {
+		root = root || document;
+		var dataEl = root.querySelector('[data-ub-mz-gallery-data="1"]');
+		if (!dataEl) { return []; }
+		try {
+			var parsed = JSON.parse((dataEl.textContent || '').trim() || '{}');
+			var urls = parsed && parsed.urls;
+			return Array.isArray(urls) ? urls.filter(Boolean) : [];
+		} catch (e) {
+			return [];
+		}
+	}
+
+	function removeGallery(root) {
+		root = root || document;
+		var existing = root.querySelector('[data-ub-mz-gallery="1"]');
+		if (existing && existing.parentElement) {
+			existing.parentElement.removeChild(existing);
+		}
+	}
+
+	function ensureGallery(root) {
+		root = root || document;
+		var urls = getUrls(root);
+		if (!urls.length) {
+			removeGallery(root);
+			return;
+		}
+
+		var cover = root.querySelector('#detailcover');
+		if (!cover) {
+			return;
+		}
+		if (root.querySelector('[data-ub-mz-gallery="1"]')) {
+			return;
+		}
+
+		var coverContainer = cover.closest('.cover') || cover.parentElement;
+		if (!coverContainer || !coverContainer.parentElement) { return; }
+
+		// Store the original src once, so we can restore after fullscreen exit.
+		if (!cover.dataset.ubOrigSrc) {
+			cover.dataset.ubOrigSrc = cover.getAttribute('src') || cover.src || '';
+		}
+
+		function isFullscreen() {
+			return !!(document.fullscreenElement || document.webkitFullscreenElement || document.mozFullScreenElement || document.msFullscreenElement);
+		}
+
+		function restoreCoverIfNeeded() {
+			if (isFullscreen()) { return; }
+			if (cover.dataset.ubTempSrc && cover.dataset.ubOrigSrc) {
+				cover.setAttribute('src', cover.dataset.ubOrigSrc);
+				delete cover.dataset.ubTempSrc;
+			}
+		}
+
+		if (!window.__ubMzGalleryFullscreenHook) {
+			window.__ubMzGalleryFullscreenHook = true;
+			document.addEventListener('fullscreenchange', restoreCoverIfNeeded);
+			document.addEventListener('webkitfullscreenchange', restoreCoverIfNeeded);
+			document.addEventListener('mozfullscreenchange', restoreCoverIfNeeded);
+			document.addEventListener('MSFullscreenChange', restoreCoverIfNeeded);
+		}
+
+		var gallery = document.createElement('div');
+		gallery.setAttribute('data-ub-mz-gallery', '1');
+		gallery.className = 'ub-mz-gallery';
+
+		urls.forEach(function(url) {
+			if (!url) { return; }
+
+			// Tile wrapper makes height:100% meaningful and keeps a consistent grid.
+			var tile = document.createElement('div');
+			tile.className = 'ub-mz-gallery__tile';
+
+			var img = document.createElement('img');
+			img.alt = '';
+			img.src = url;
+			img.className = 'ub-mz-gallery__img';
+			img.addEventListener('click', function() {
+				if (!cover.dataset.ubOrigSrc) {
+					cover.dataset.ubOrigSrc = cover.getAttribute('src') || cover.src || '';
+				}
+				cover.dataset.ubTempSrc = url;
+				cover.setAttribute('src', url);
+
+				if (isFullscreen()) {
+					return;
+				}
+				// Fullscreen API requires a real user gesture. Calling the upstream helper
+				// directly from THIS click handler preserves that gesture.
+				if (typeof window.toggleFullscreen === 'function') {
+					window.toggleFullscreen(cover);
+					return;
+				}
+				// Fallback: directly request fullscreen.
+				var req = cover.requestFullscreen || cover.webkitRequestFullscreen || cover.mozRequestFullScreen || cover.msRequestFullscreen;
+				if (req) { req.call(cover); }
+			});
+
+			tile.appendChild(img);
+			gallery.appendChild(tile);
+		});
+
+		coverContainer.parentElement.insertBefore(gallery, coverContainer.nextSibling);
+	}
+
+	function init() {
+		ensureGallery(document);
+	}
+
+	if (document.readyState === 'loading') {
+		document.addEventListener('DOMContentLoaded', init);
+	} else {
+		init();
+	}
+
+	// When rendered into the modal via AJAX, ensure we bind after it is shown.
+	if (window.jQuery && typeof window.jQuery === 'function' && window.jQuery.fn && window.jQuery.fn.modal) {
+		window.jQuery('#bookDetailsModal').on('shown.bs.modal', function() {
+			ensureGallery(this);
+		});
+	}
+})();
@@ -10,6 +10,7 @@ from .identity import (
     get_current_user_id,
     is_admin_user,
     ensure_admin,
+    admin_guard,
     PermissionError,
 )
 from . import constants  # re-export module for ROLE_ADMIN access
@@ -21,6 +22,7 @@ __all__ = [
     "get_current_user_id",
     "is_admin_user",
     "ensure_admin",
+    "admin_guard",
     "PermissionError",
     "constants",
 ]
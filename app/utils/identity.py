@@ -1,6 +1,7 @@
 """Identity & permission helpers migrated from plugin utils (subset)."""
 from __future__ import annotations
-from typing import Optional, Any
+from functools import wraps
+from typing import Any, Callable, Optional
 from flask import session
 
 from app import config as app_config
@@ -149,6 +150,26 @@ def ensure_admin() -> None:
         raise PermissionError("Admin privileges required")
 
 
+def admin_guard(check: Callable[[], Any]):
+    """Build a view decorator that returns ``check()``'s response unless it is True.
+
+    ``check`` wraps :func:`ensure_admin` and decides how a denial is answered
+    (login redirect, JSON 403, ...).
+    """
+
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            auth = check()
+            if auth is not True:
+                return auth
+            return view(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
 __all__ = [
     "normalize_email",
     "get_session_email_key",
@@ -157,6 +178,7 @@ __all__ = [
     "clear_identity_session",
     "is_admin_user",
     "ensure_admin",
+    "admin_guard",
     "PermissionError",
     "constants",
 ]
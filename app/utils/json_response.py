@@ -0,0 +1,68 @@
+"""JSON response helper for payload-heavy admin endpoints.
+
+Uses ``orjson`` when installed (serializes large lists of plain dicts in C);
+falls back to Flask's ``jsonify`` so behaviour is unchanged without it.
+"""
+from __future__ import annotations
+
+import json
+from typing import Any, Iterable, Iterator
+
+from flask import Response, jsonify, request
+
+try:  # pragma: no cover - optional speedup
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+
+
+def json_response(payload: Any, status: int = 200, *, conditional: bool = False) -> Response:
+    """Return ``payload`` serialized as an ``application/json`` response.
+
+    With ``conditional=True`` the response carries a content ETag and is
+    turned into an empty 304 when the client's ``If-None-Match`` matches, so
+    admin pages that reload an unchanged list skip the transfer and parse.
+    """
+    if orjson is None:
+        resp = jsonify(payload)
+        resp.status_code = status
+    else:
+        resp = Response(orjson.dumps(payload), status=status, mimetype="application/json")
+    if conditional:
+        resp.cache_control.private = True
+        resp.cache_control.no_cache = True
+        resp.add_etag()
+        resp.make_conditional(request)
+    return resp
+
+
+def ndjson_response(items: Iterable[Any]) -> Response:
+    """Stream ``items`` as newline-delimited JSON (``application/x-ndjson``).
+
+    Each item is encoded as it is produced, so memory stays flat and the first
+    line is sent before the whole result set has been read. Anything that can
+    fail before the first item should run before this is called: once the
+    response is returned its status is already 200.
+    """
+
+    def _generate() -> Iterator[bytes]:
+        try:
+            for item in items:
+                if orjson is None:
+                    yield json.dumps(item, ensure_ascii=False).encode("utf-8") + b"\n"
+                else:
+                    yield orjson.dumps(item) + b"\n"
+        finally:
+            close = getattr(items, "close", None)
+            if callable(close):
+                close()
+
+    resp = Response(_generate(), mimetype="application/x-ndjson")
+    close = getattr(items, "close", None)
+    if callable(close):
+        # Also release ``items`` when the response is closed before streaming.
+        resp.call_on_close(close)
+    return resp
+
+
+__all__ = ["json_response", "ndjson_response"]
@@ -8,21 +8,23 @@ from __future__ import annotations
 
 import logging
 import threading
-from typing import Optional
+from typing import Dict
 
 from app import config as app_config
 
 _LOCK = threading.Lock()
-_PRIMARY: Optional[logging.Logger] = None
+# Loggers already configured by get_logger; later calls skip the level/handler setup.
+_CONFIGURED: Dict[str, logging.Logger] = {}
 
 
 def get_logger(name: str = "app") -> logging.Logger:
-    global _PRIMARY
-    if name == "app" and _PRIMARY is not None:
-        return _PRIMARY
+    logger = _CONFIGURED.get(name)
+    if logger is not None:
+        return logger
     with _LOCK:
-        if name == "app" and _PRIMARY is not None:
-            return _PRIMARY
+        logger = _CONFIGURED.get(name)
+        if logger is not None:
+            return logger
         logger = logging.getLogger(name)
         level_name = app_config.log_level_name()
         level = getattr(logging, level_name, logging.INFO)
@@ -32,8 +34,7 @@ def get_logger(name: str = "app") -> logging.Logger:
             handler.setFormatter(logging.Formatter("[app] %(asctime)s %(levelname)s %(name)s %(message)s"))
             logger.addHandler(handler)
         logger.propagate = False
-        if name == "app":
-            _PRIMARY = logger
+        _CONFIGURED[name] = logger
         return logger
 
 
@@ -22,9 +22,8 @@ BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 CALIBRE_SUBMODULE = os.path.join(BASE_DIR, "calibre-web")
 APP_DIR = os.path.join(BASE_DIR, "app")
 
-for path_candidate in (CALIBRE_SUBMODULE, APP_DIR, BASE_DIR):
-    if path_candidate not in sys.path:
-        sys.path.insert(0, path_candidate)
+_existing_paths = set(sys.path)
+sys.path[:0] = [p for p in (BASE_DIR, APP_DIR, CALIBRE_SUBMODULE) if p not in _existing_paths]
 
 
 # -----------------------------------------------------------------------------
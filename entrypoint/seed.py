@@ -11,6 +11,7 @@ Exit Codes:
 from __future__ import annotations
 
 from pathlib import Path
+import shutil
 import sys
 
 
@@ -53,7 +54,7 @@ def _ensure_lv_locale_assets() -> bool:
                 ok = False
                 continue
             dst.parent.mkdir(parents=True, exist_ok=True)
-            dst.write_bytes(src.read_bytes())
+            shutil.copyfile(src, dst)
             print(f"[SEED] assets ok installed {dst.relative_to(repo_root)}")
         return ok
     except Exception as exc:  # pragma: no cover
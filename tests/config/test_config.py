@@ -0,0 +1,30 @@
+"""Tests for environment parsing helpers in app.config."""
+from __future__ import annotations
+
+import pytest  # type: ignore[import-not-found]
+
+from app.config import env_bool
+
+
+@pytest.mark.parametrize("raw", ["1", "true", "Yes", " ON "])
+def test_env_bool_truthy_spellings(monkeypatch, raw):
+    monkeypatch.setenv("EBOOKSLV_TEST_FLAG", raw)
+    assert env_bool("EBOOKSLV_TEST_FLAG") is True
+
+
+@pytest.mark.parametrize("raw", ["0", "false", "No", " off "])
+def test_env_bool_falsy_spellings_override_default(monkeypatch, raw):
+    monkeypatch.setenv("EBOOKSLV_TEST_FLAG", raw)
+    assert env_bool("EBOOKSLV_TEST_FLAG", default=True) is False
+
+
+@pytest.mark.parametrize("raw", ["ture", "", "2"])
+def test_env_bool_unrecognized_value_returns_default(monkeypatch, raw):
+    monkeypatch.setenv("EBOOKSLV_TEST_FLAG", raw)
+    assert env_bool("EBOOKSLV_TEST_FLAG", default=True) is True
+    assert env_bool("EBOOKSLV_TEST_FLAG", default=False) is False
+
+
+def test_env_bool_unset_returns_default(monkeypatch):
+    monkeypatch.delenv("EBOOKSLV_TEST_FLAG", raising=False)
+    assert env_bool("EBOOKSLV_TEST_FLAG", default=True) is True
@@ -4,6 +4,18 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config_cache():
+    """Let each test's monkeypatched environment reach the memoized accessors."""
+    from app.config import reset_config_cache
+
+    reset_config_cache()
+    yield
+    reset_config_cache()
@@ -0,0 +1,55 @@
+"""Tests for the /admin/ebookslv/books/api/data endpoint."""
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest  # type: ignore[import-not-found]
+from flask import Flask
+
+from app.routes.admin_ebookslv import register_ebookslv_blueprint
+from app.services import books_sync
+
+
+@pytest.fixture
+def admin_client(monkeypatch):
+    app = Flask(__name__)
+    app.config["SECRET_KEY"] = "books-secret"
+    register_ebookslv_blueprint(app)
+    monkeypatch.setattr("app.routes.admin_ebookslv.ensure_admin", lambda prefer_redirect=False: True)
+    with app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def metadata_db(tmp_path, monkeypatch):
+    path = tmp_path / "metadata.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE books (id INTEGER PRIMARY KEY, title TEXT)")
+    conn.executemany("INSERT INTO books (id, title) VALUES (?, ?)", [(1, "Pirmā"), (2, "Otrā")])
+    conn.commit()
+    conn.close()
+    monkeypatch.setattr(books_sync, "_connect_rw", lambda: sqlite3.connect(path))
+    return path
+
+
+def test_stream_returns_one_book_per_line(admin_client, metadata_db):
+    resp = admin_client.get("/admin/ebookslv/books/api/data?stream=1")
+
+    assert resp.status_code == 200
+    assert resp.mimetype == "application/x-ndjson"
+    rows = [json.loads(line) for line in resp.get_data().decode("utf-8").splitlines()]
+    assert [(r["book_id"], r["title"]) for r in rows] == [(1, "Pirmā"), (2, "Otrā")]
+    assert rows == admin_client.get("/admin/ebookslv/books/api/data").get_json()["rows"]
+
+
+def test_stream_reports_setup_failure_before_sending_a_status(admin_client, monkeypatch):
+    def unavailable():
+        raise sqlite3.OperationalError("unable to open database file")
+
+    monkeypatch.setattr(books_sync, "_connect_rw", unavailable)
+
+    resp = admin_client.get("/admin/ebookslv/books/api/data?stream=1")
+
+    assert resp.status_code == 500
+    assert resp.mimetype != "application/x-ndjson"
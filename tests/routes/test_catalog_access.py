@@ -6,6 +6,7 @@ from flask import Flask
 
 from app.routes.overrides import catalog_access
 from app.routes.overrides.catalog_access import CatalogScope, register_catalog_access
+from app.services import catalog_access as catalog_access_service
 from app.services.catalog_access import UserCatalogState
 
 
@@ -91,3 +92,67 @@ def test_catalog_free_books_does_not_scope_other_pages(catalog_app, client):
     resp = client.get("/catalog/free-books/unread/stored/")
     assert resp.status_code == 302
     assert resp.headers["Location"].endswith("/unread/stored/")
+
+
+def test_catalog_state_book_state_coerces_ids():
+    state = UserCatalogState(
+        is_admin=False,
+        is_authenticated=True,
+        purchased_book_ids=frozenset({1, 3}),
+        free_book_ids=frozenset({2, 3}),
+    )
+    assert state.book_state(1).value == "purchased"
+    assert state.book_state("3").value == "purchased"
+    assert state.book_state(2).value == "free"
+    assert state.book_state("x").value == "available"
+    assert state.book_state(None).value == "available"
+    assert state.is_free("2") and not state.is_purchased(None)
+
+
+def test_build_catalog_state_reuses_state_within_request(monkeypatch):
+    loads: list[int] = []
+
+    def fake_free_ids():
+        loads.append(1)
+        return {2}
+
+    links = [(1, "book-1")]
+    monkeypatch.setattr(catalog_access_service.books_sync, "list_free_book_ids", fake_free_ids)
+    monkeypatch.setattr(
+        catalog_access_service.users_books_repo,
+        "list_order_links_for_user",
+        lambda **_kwargs: list(links),
+    )
+    app = Flask(__name__)
+
+    with app.app_context():
+        first = catalog_access_service.build_catalog_state(calibre_user_id=5, email="A@Example.com", is_admin=False)
+        second = catalog_access_service.build_catalog_state(calibre_user_id=5, email="a@example.com", is_admin=False)
+        assert second is first
+        assert first.purchased_book_ids == frozenset({1})
+        assert len(loads) == 1
+
+        # The webhook path busts the request cache after recording a purchase.
+        links.append((4, "book-4"))
+        catalog_access_service.invalidate_catalog_state_cache()
+        third = catalog_access_service.build_catalog_state(calibre_user_id=5, email="a@example.com", is_admin=False)
+        assert third.purchased_book_ids == frozenset({1, 4})
+        assert len(loads) == 2
+
+    # A purchase or price change from another worker shows up on the next request.
+    links.append((7, "book-7"))
+    with app.app_context():
+        state = catalog_access_service.build_catalog_state(calibre_user_id=5, email="a@example.com", is_admin=False)
+    assert state.purchased_book_ids == frozenset({1, 4, 7})
+    assert len(loads) == 3
+
+
+def test_cached_states_share_one_free_id_set(monkeypatch):
+    monkeypatch.setattr(catalog_access_service.books_sync, "list_free_book_ids", lambda: {2, 4})
+
+    with Flask(__name__).app_context():
+        anonymous = catalog_access_service.build_catalog_state(calibre_user_id=None, email=None, is_admin=False)
+        admin = catalog_access_service.build_catalog_state(calibre_user_id=1, email="admin@example.com", is_admin=True)
+
+    assert anonymous.free_book_ids == frozenset({2, 4})
+    assert admin.free_book_ids is anonymous.free_book_ids
@@ -0,0 +1,52 @@
+"""Tests for cached gzip delivery of app static assets."""
+from __future__ import annotations
+
+import gzip
+
+import pytest
+from flask import Blueprint, Flask
+
+from app.routes.overrides import static_gzip
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_gzip, "_GZIP_CACHE", {})
+    (tmp_path / "app.js").write_text("console.log('ebooks');\n" * 100, encoding="utf-8")
+    (tmp_path / "tiny.css").write_text("a{}", encoding="utf-8")
+    app = Flask(__name__)
+    app.register_blueprint(
+        Blueprint("_app_templates", __name__, static_folder=str(tmp_path), static_url_path="/app_static")
+    )
+    static_gzip.register_static_gzip(app)
+    return app.test_client()
+
+
+def test_static_asset_served_gzip_from_cache(client):
+    raw = ("console.log('ebooks');\n" * 100).encode("utf-8")
+    for _ in range(2):
+        resp = client.get("/app_static/app.js", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in resp.headers["Vary"]
+        assert gzip.decompress(resp.data) == raw
+        resp.close()
+    assert len(static_gzip._GZIP_CACHE) == 1
+
+
+def test_static_asset_identity_when_not_accepted_or_small(client):
+    resp = client.get("/app_static/app.js")
+    assert "Content-Encoding" not in resp.headers
+    resp.close()
+    resp = client.get("/app_static/tiny.css", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.data == b"a{}"
+    resp.close()
+
+
+def test_versioned_static_asset_cached_immutable(client):
+    resp = client.get("/app_static/app.js?v=abc123")
+    assert resp.headers["Cache-Control"] == static_gzip.IMMUTABLE_CACHE_CONTROL
+    resp.close()
+    resp = client.get("/app_static/app.js")
+    assert "immutable" not in resp.headers.get("Cache-Control", "")
+    resp.close()
@@ -128,3 +128,4 @@ def test_normalize_language_preference_handles_unknown():
     assert calibre_users_service._normalize_language_preference(None) is None
     assert calibre_users_service._normalize_language_preference("   ") is None
     assert calibre_users_service._normalize_language_preference("de") is None
+
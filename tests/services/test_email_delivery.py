@@ -223,3 +223,11 @@ def test_send_password_reset_email_queues_task(monkeypatch, request_context):
     assert task.recipient == "reader@example.com"
     assert reset_url in task.html_body
     assert reset_url in task.text_body
+
+
+def test_render_template_reuses_compiled_template():
+    source = "Hello {{user_name}}"
+    first = email_delivery._JINJA_ENV.get_template(source)
+    assert email_delivery._JINJA_ENV.get_template(source) is first
+    assert email_delivery._render_template(source, {"user_name": "Ann"}) == "Hello Ann"
+    assert email_delivery._render_template(source, {"user_name": "Bob"}) == "Hello Bob"
@@ -1,9 +1,12 @@
 """Tests for email_templates_service subject handling."""
 from __future__ import annotations
 
+from contextlib import contextmanager
+
 import pytest
 
 from app.db.engine import init_engine_once, reset_for_tests
+from app.db.repositories import email_templates_repo
 from app.services import email_templates_service
 
 
@@ -12,6 +15,7 @@ def in_memory_db(monkeypatch):
     reset_for_tests(drop=True)
     monkeypatch.setenv("USERS_BOOKS_DB_PATH", ":memory:")
     init_engine_once()
+    email_templates_repo.invalidate_template_cache()
     yield
     reset_for_tests(drop=True)
 
@@ -46,3 +50,55 @@ def test_save_template_rejects_multiline_subject():
             html_body="<p>Body</p>",
             subject="Line 1\nLine 2",
         )
+
+
+def test_get_templates_fetches_requested_pairs():
+    email_templates_service.save_template(
+        template_key="book_purchase",
+        language="lv",
+        html_body="<p>LV</p>",
+        subject="LV",
+    )
+    email_templates_service.save_template(
+        template_key="book_purchase",
+        language="ru",
+        html_body="<p>RU</p>",
+        subject="RU",
+    )
+
+    records = email_templates_repo.get_templates(
+        [("book_purchase", "lv"), ("book_purchase", "en"), ("book_purchase", "lv")]
+    )
+
+    assert set(records) == {("book_purchase", "lv")}
+    assert records[("book_purchase", "lv")].subject == "LV"
+
+
+def test_get_template_cache_is_cleared_by_save():
+    assert email_templates_repo.get_template("password_reset", "en") is None
+
+    email_templates_service.save_template(
+        template_key="password_reset",
+        language="en",
+        html_body="<p>Reset</p>",
+        subject="Reset",
+    )
+
+    record = email_templates_repo.get_template("password_reset", "en")
+    assert record is not None
+    assert record.subject == "Reset"
+
+
+def test_get_templates_skips_store_when_invalidated_during_load(monkeypatch):
+    real_session = email_templates_repo.plugin_session
+
+    @contextmanager
+    def session_with_concurrent_save():
+        with real_session() as session:
+            yield session
+        email_templates_repo.invalidate_template_cache()  # another thread saved meanwhile
+
+    monkeypatch.setattr(email_templates_repo, "plugin_session", session_with_concurrent_save)
+    assert email_templates_repo.get_template("password_reset", "en") is None
+
+    assert email_templates_repo._TEMPLATE_CACHE == {}
@@ -22,7 +22,7 @@ def test_upsert_product_basic_sets_text_merge_mode(monkeypatch):
 
     monkeypatch.setattr(mozello_service, "_api_headers", lambda: {"Authorization": "ApiKey test"})
     monkeypatch.setattr(mozello_service, "_throttle_wait", lambda: None)
-    monkeypatch.setattr(mozello_service.requests, "put", fake_put)
+    monkeypatch.setattr(mozello_service._HTTP, "put", fake_put)
     monkeypatch.setattr(mozello_service, "invalidate_cache", lambda: None)
 
     ok, _ = mozello_service.upsert_product_basic(
@@ -55,7 +55,7 @@ def test_upsert_product_minimal_sets_text_merge_mode(monkeypatch):
 
     monkeypatch.setattr(mozello_service, "_api_headers", lambda: {"Authorization": "ApiKey test"})
     monkeypatch.setattr(mozello_service, "_throttle_wait", lambda: None)
-    monkeypatch.setattr(mozello_service.requests, "put", fake_put)
+    monkeypatch.setattr(mozello_service._HTTP, "put", fake_put)
     monkeypatch.setattr(mozello_service, "invalidate_cache", lambda: None)
 
     ok, _ = mozello_service.upsert_product_minimal("book-8", "Title", 10.5)
@@ -81,7 +81,7 @@ def test_add_product_picture_invalidates_cache(monkeypatch):
 
     monkeypatch.setattr(mozello_service, "_api_headers", lambda: {"Authorization": "ApiKey test"})
     monkeypatch.setattr(mozello_service, "_throttle_wait", lambda: None)
-    monkeypatch.setattr(mozello_service.requests, "post", fake_post)
+    monkeypatch.setattr(mozello_service._HTTP, "post", fake_post)
     monkeypatch.setattr(mozello_service, "invalidate_cache", lambda: called.__setitem__("inv", called["inv"] + 1))
 
     ok, _ = mozello_service.add_product_picture("book-1", "Zm9v", filename="calibre-cover.jpg")
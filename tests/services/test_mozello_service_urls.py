@@ -75,7 +75,7 @@ def test_upsert_product_basic_sets_url_for_all_languages(monkeypatch):
 
     monkeypatch.setattr(mozello_service, "_api_headers", lambda: {"Authorization": "ApiKey test"})
     monkeypatch.setattr(mozello_service, "_throttle_wait", lambda: None)
-    monkeypatch.setattr(mozello_service.requests, "put", fake_put)
+    monkeypatch.setattr(mozello_service._HTTP, "put", fake_put)
 
     ok, _ = mozello_service.upsert_product_basic(
         handle="book-8",
@@ -108,7 +108,7 @@ def test_upsert_product_minimal_sets_url_for_all_languages(monkeypatch):
 
     monkeypatch.setattr(mozello_service, "_api_headers", lambda: {"Authorization": "ApiKey test"})
     monkeypatch.setattr(mozello_service, "_throttle_wait", lambda: None)
-    monkeypatch.setattr(mozello_service.requests, "put", fake_put)
+    monkeypatch.setattr(mozello_service._HTTP, "put", fake_put)
 
     ok, _ = mozello_service.upsert_product_minimal("book-8", "Title", 10.5)
     assert ok is True
@@ -0,0 +1,61 @@
+import base64
+import hashlib
+import hmac
+import json
+
+import pytest
+
+from app.db.engine import init_engine_once, reset_for_tests
+from app.services import mozello_service
+
+
+@pytest.fixture(autouse=True)
+def in_memory_db(monkeypatch):
+    reset_for_tests(drop=True)
+    monkeypatch.setenv("USERS_BOOKS_DB_PATH", ":memory:")
+    monkeypatch.delenv("MOZELLO_API_KEY", raising=False)
+    init_engine_once()
+    mozello_service._invalidate_api_key_cache()
+    yield
+    mozello_service._invalidate_api_key_cache()
+    reset_for_tests(drop=True)
+
+
+def _sign(body: bytes, key: str) -> str:
+    return base64.b64encode(hmac.new(key.encode("utf-8"), body, hashlib.sha256).digest()).decode()
+
+
+def test_verify_signature_rejects_mismatch_and_non_ascii():
+    body = b'{"event":"PAYMENT_CHANGED"}'
+    assert mozello_service.verify_signature(body, _sign(body, "secret"), "secret")
+    assert not mozello_service.verify_signature(body, _sign(body, "other"), "secret")
+    assert not mozello_service.verify_signature(body, "ā" * 44, "secret")
+    assert not mozello_service.verify_signature(body, "", "secret")
+    assert mozello_service.verify_signature(body, _sign(body, "secret"), b"secret")
+
+
+def test_handle_webhook_uses_updated_api_key():
+    body = json.dumps({"event": "payment_changed", "order": {"order_id": "A1"}}).encode()
+    mozello_service.update_settings("first", None, None)
+    ok, event, _ = mozello_service.handle_webhook(body, {"X-Mozello-Hash": _sign(body, "first")})
+    assert (ok, event) == (True, "PAYMENT_CHANGED")
+
+    mozello_service.update_settings("second", None, None)
+    ok, event, _ = mozello_service.handle_webhook(body, {"X-Mozello-Hash": _sign(body, "first")})
+    assert (ok, event) == (False, "signature_invalid")
+    ok, _, _ = mozello_service.handle_webhook(body, {"X-Mozello-Hash": _sign(body, "second")})
+    assert ok
+
+
+def test_handle_webhook_rejects_non_object_json():
+    mozello_service.update_settings("key", None, None)
+    for body in (b"[1, 2]", b"not json"):
+        ok, reason, payload = mozello_service.handle_webhook(body, {"X-Mozello-Hash": _sign(body, "key")})
+        assert (ok, reason, payload) == (False, "invalid_json", None)
+
+
+def test_handle_webhook_uses_environment_api_key(monkeypatch):
+    monkeypatch.setenv("MOZELLO_API_KEY", "  env-key  ")
+    body = json.dumps({"event": "payment_changed", "order": {"order_id": "A2"}}).encode()
+    ok, event, _ = mozello_service.handle_webhook(body, {"X-Mozello-Hash": _sign(body, "env-key")})
+    assert (ok, event) == (True, "PAYMENT_CHANGED")
@@ -0,0 +1,45 @@
+"""Tests for operator_manual_service HTML caching."""
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from app.services import operator_manual_service
+
+
+@pytest.fixture
+def docs_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(operator_manual_service, "_docs_dir", lambda: tmp_path)
+    monkeypatch.setattr(operator_manual_service, "_HTML_CACHE", {})
+    for name in ("admin_hub", "user_management", "books_management"):
+        (tmp_path / f"{name}.md").write_text(f"# {name}\n", encoding="utf-8")
+    return tmp_path
+
+
+def test_render_reuses_html_until_a_section_changes(docs_dir, monkeypatch):
+    calls = []
+    original = operator_manual_service._markdown_to_html
+
+    def counting(text):
+        calls.append(text)
+        return original(text)
+
+    monkeypatch.setattr(operator_manual_service, "_markdown_to_html", counting)
+
+    first = operator_manual_service.render_operator_manual_html("en")
+    assert operator_manual_service.render_operator_manual_html("en") == first
+    assert len(calls) == 1
+
+    section = docs_dir / "user_management.md"
+    section.write_text("# Users updated\n", encoding="utf-8")
+    stat = section.stat()
+    os.utime(section, (stat.st_atime, stat.st_mtime + 5))
+    assert "Users updated" in operator_manual_service.render_operator_manual_html("en")
+    assert len(calls) == 2
+
+
+def test_render_switches_to_localized_section_when_added(docs_dir):
+    assert "admin_hub" in operator_manual_service.render_operator_manual_html("lv")
+    (docs_dir / "admin_hub_lv.md").write_text("# Sākums\n", encoding="utf-8")
+    assert "Sākums" in operator_manual_service.render_operator_manual_html("lv")
@@ -1,6 +1,7 @@
 """Integration tests for orders_service.process_webhook_order."""
 from __future__ import annotations
 
+import dataclasses
 from typing import Dict, List, Optional
 
 import pytest  # type: ignore[import-not-found]
@@ -111,6 +112,8 @@ def test_process_webhook_order_triggers_token_and_email(monkeypatch, request_con
     assert summary["books_included"] == 2
     assert summary["email_queued"] is True
     assert summary["initial_token_issued"] is True
+    assert [o["user_status"] for o in summary["orders"]] == ["created", "already_linked"]
+    assert {o.calibre_user_id for o in users_books_repo.list_orders()} == {77}
 
     assert wishlist_calls == [{"user_id": 77, "user_locale": "lv"}]
 
@@ -247,4 +250,93 @@ def test_process_webhook_order_email_language_prefers_order_hint(monkeypatch, re
     result = orders_service.process_webhook_order(payload)
     assert result["summary"]["email_queued"] is True
     assert len(email_calls) == 1
-    assert email_calls[0]["preferred_language"] == "ru"
\ No newline at end of file
+    assert email_calls[0]["preferred_language"] == "ru"
+
+
+def test_import_paid_orders_creates_new_pairs_and_skips_existing(monkeypatch):
+    existing = users_books_repo.create_order("old@example.com", "book-a")
+    payload = {
+        "orders": [
+            {
+                "email": "Old@Example.com",
+                "created_at": "2024-05-01 10:00:00",
+                "cart": [{"product_handle": "book-a"}, {"product_handle": "book-b"}],
+            },
+            {
+                "email": "new@example.com",
+                "cart": [{"product_handle": "Book-A"}, {"product_handle": "book-a"}],
+            },
+        ]
+    }
+    monkeypatch.setattr(orders_service.mozello_service, "fetch_paid_orders", lambda **_k: (True, payload))
+    monkeypatch.setattr(
+        orders_service.books_sync,
+        "lookup_books_by_handles",
+        lambda handles: {"book-a": {"book_id": 5}} if "book-a" in handles else {},
+    )
+    monkeypatch.setattr(
+        orders_service,
+        "lookup_users_by_emails",
+        lambda emails: {"new@example.com": {"id": 9}},
+    )
+
+    result = orders_service.import_paid_orders()
+
+    summary = result["summary"]
+    assert summary["created"] == 2
+    assert summary["skipped_existing"] == 1
+    assert summary["errors"] == []
+    orders = {(o.email, o.mz_handle): o for o in users_books_repo.list_orders()}
+    assert set(orders) == {
+        ("old@example.com", "book-a"),
+        ("old@example.com", "book-b"),
+        ("new@example.com", "Book-A"),
+    }
+    assert sorted(summary["created_ids"]) == sorted(
+        o.id for key, o in orders.items() if key != ("old@example.com", "book-a")
+    )
+    assert orders[("new@example.com", "Book-A")].calibre_user_id == 9
+    assert orders[("new@example.com", "Book-A")].calibre_book_id == 5
+    assert orders[("old@example.com", "book-a")].id == existing.id
+
+
+def test_bulk_update_links_keeps_unset_columns_and_last_duplicate():
+    first = users_books_repo.create_order("a@example.com", "book-a", calibre_user_id=3)
+    second = users_books_repo.create_order("b@example.com", "book-b", calibre_book_id=7)
+
+    users_books_repo.bulk_update_links([
+        (second.id, 4, None),
+        (first.id, None, 11),
+        (second.id, 5, None),
+    ])
+
+    orders = {o.id: o for o in users_books_repo.list_orders()}
+    assert (orders[first.id].calibre_user_id, orders[first.id].calibre_book_id) == (3, 11)
+    assert (orders[second.id].calibre_user_id, orders[second.id].calibre_book_id) == (5, 7)
+
+
+def test_list_order_rows_matches_list_orders():
+    users_books_repo.create_order("a@example.com", "book-a", calibre_user_id=3)
+    users_books_repo.create_order("b@example.com", "book-b", calibre_book_id=8)
+
+    rows = users_books_repo.list_order_rows()
+    orders = users_books_repo.list_orders()
+
+    assert [(r.id, r.email, r.mz_handle, r.calibre_user_id, r.calibre_book_id) for r in rows] == [
+        (o.id, o.email, o.mz_handle, o.calibre_user_id, o.calibre_book_id) for o in orders
+    ]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        rows[0].email = "x"  # type: ignore[misc]
+
+
+def test_list_order_links_for_user_matches_id_or_email():
+    users_books_repo.create_order("a@example.com", "book-a", calibre_book_id=1)
+    users_books_repo.create_order("other@example.com", "book-b", calibre_user_id=3, calibre_book_id=2)
+    users_books_repo.create_order("c@example.com", "book-c", calibre_book_id=5)
+
+    assert sorted(users_books_repo.list_order_links_for_user(email="a@example.com")) == [(1, "book-a")]
+    assert sorted(users_books_repo.list_order_links_for_user(calibre_user_id=3)) == [(2, "book-b")]
+    assert sorted(
+        users_books_repo.list_order_links_for_user(calibre_user_id=3, email="a@example.com")
+    ) == [(1, "book-a"), (2, "book-b")]
+    assert users_books_repo.list_order_links_for_user() == []
@@ -1,6 +1,7 @@
 """Tests for password_reset_service helpers."""
 from __future__ import annotations
 
+import threading
 from types import SimpleNamespace
 
 import pytest
@@ -168,3 +169,24 @@ def test_purge_expired_records_passthrough(monkeypatch):
     )
 
     assert password_reset_service.purge_expired_records(older_than_days=10) == 10
+
+
+def test_token_sweeper_prunes_on_start_and_is_idempotent(monkeypatch):
+    swept = threading.Event()
+    calls = []
+
+    def fake_purge(older_than_days):
+        calls.append(older_than_days)
+        swept.set()
+        return 0
+
+    monkeypatch.setattr(password_reset_service.reset_passwords_repo, "purge_expired_tokens", fake_purge)
+
+    password_reset_service.start_token_sweeper(interval=3600)
+    password_reset_service.start_token_sweeper(interval=3600)
+    try:
+        assert swept.wait(timeout=2)
+    finally:
+        password_reset_service.stop_token_sweeper()
+
+    assert calls == [30]
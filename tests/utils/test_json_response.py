@@ -0,0 +1,60 @@
+"""Tests for the JSON response helper."""
+from __future__ import annotations
+
+import json
+
+from flask import Flask
+
+from app.utils.json_response import json_response, ndjson_response
+
+
+def test_json_response_serializes_payload_with_status():
+    app = Flask(__name__)
+    payload = {"rows": [{"book_id": 1, "title": "Grāmata", "mz_price": 6.5}], "source": "calibre"}
+    with app.app_context():
+        resp = json_response(payload, status=201)
+    assert resp.status_code == 201
+    assert resp.mimetype == "application/json"
+    assert json.loads(resp.get_data()) == payload
+
+
+def test_json_response_conditional_returns_304_for_matching_etag():
+    app = Flask(__name__)
+    state = {"payload": {"orders": [{"id": 1}], "summary": {"total": 1}}}
+    app.add_url_rule("/list", view_func=lambda: json_response(state["payload"], conditional=True))
+    client = app.test_client()
+
+    first = client.get("/list")
+    etag = first.headers["ETag"]
+    assert first.status_code == 200
+    second = client.get("/list", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.data == b""
+
+    state["payload"] = {"orders": [], "summary": {"total": 0}}
+    changed = client.get("/list", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_ndjson_response_streams_one_object_per_line():
+    app = Flask(__name__)
+    closed = []
+
+    def rows():
+        try:
+            yield {"book_id": 1, "title": "Grāmata"}
+            yield {"book_id": 2, "title": None}
+        finally:
+            closed.append(True)
+
+    app.add_url_rule("/rows", view_func=lambda: ndjson_response(rows()))
+    resp = app.test_client().get("/rows")
+
+    assert resp.mimetype == "application/x-ndjson"
+    lines = resp.get_data().decode("utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == [
+        {"book_id": 1, "title": "Grāmata"},
+        {"book_id": 2, "title": None},
+    ]
+    assert closed == [True]